@@ -0,0 +1,156 @@
+"""Fixtures shared by the tests of mpsim."""
+
+import types
+
+import numpy as np
+import pytest
+
+import mpsim.core
+
+
+class DeviceArray(np.lib.mixins.NDArrayOperatorsMixin):
+    """Array on a mock GPU which behaves like a CuPy array.
+
+    NumPy functions and ufuncs called on a DeviceArray are forwarded to its
+    own array module, and mixing it with NumPy arrays is an error. Unlike a
+    NumPy array, it can't be implicitly converted to one, so host code such as
+    np.ascontiguousarray raises a TypeError.
+    """
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def __array__(self, dtype=None):
+        raise TypeError(
+            "Implicit conversion to a NumPy array is not allowed. Use get()."
+        )
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return _to_device(
+            getattr(ufunc, method)(*_from_device(inputs), **kwargs)
+        )
+
+    def __array_function__(self, func, types, args, kwargs):
+        return _to_device(func(*_from_device(args), **_from_device(kwargs)))
+
+    def __getitem__(self, key):
+        return _to_device(self._array[key])
+
+    def __setitem__(self, key, value):
+        self._array[key] = _from_device(value)
+
+    def __float__(self):
+        return float(self._array)
+
+    def __complex__(self):
+        return complex(self._array)
+
+    def __len__(self):
+        return len(self._array)
+
+    @property
+    def shape(self):
+        return self._array.shape
+
+    @property
+    def ndim(self):
+        return self._array.ndim
+
+    @property
+    def size(self):
+        return self._array.size
+
+    @property
+    def dtype(self):
+        return self._array.dtype
+
+    @property
+    def T(self):
+        return DeviceArray(self._array.T)
+
+    @property
+    def real(self):
+        return DeviceArray(self._array.real)
+
+    def conj(self):
+        return DeviceArray(self._array.conj())
+
+    def reshape(self, *shape):
+        return DeviceArray(self._array.reshape(*shape))
+
+    def astype(self, dtype, copy=True):
+        return DeviceArray(self._array.astype(dtype, copy=copy))
+
+    def get(self) -> np.ndarray:
+        """Returns a copy of the array on the host."""
+        return self._array.copy()
+
+
+def _from_device(value):
+    """Returns the NumPy arrays wrapped by the DeviceArrays in the value.
+
+    Raises:
+        TypeError: If the value contains a NumPy array, which a GPU array
+            module can't operate on.
+    """
+    if isinstance(value, DeviceArray):
+        return value._array
+    if isinstance(value, np.ndarray):
+        raise TypeError("Unsupported type <class 'numpy.ndarray'>.")
+    if isinstance(value, (list, tuple)):
+        return type(value)(_from_device(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _from_device(item) for key, item in value.items()}
+    return value
+
+
+def _to_device(value):
+    """Returns the value with NumPy arrays wrapped as DeviceArrays."""
+    if isinstance(value, np.ndarray):
+        return DeviceArray(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_device(item) for item in value)
+    return value
+
+
+def _device_function(func):
+    """Returns the NumPy function as a function on DeviceArrays."""
+    def device_func(*args, **kwargs):
+        return _to_device(func(*_from_device(args), **_from_device(kwargs)))
+    return device_func
+
+
+def _asarray(array, dtype=None, order=None) -> DeviceArray:
+    """Returns the array copied to the mock GPU."""
+    if isinstance(array, DeviceArray):
+        array = array._array
+    return DeviceArray(np.array(array, dtype=dtype, order=order or "K"))
+
+
+fake_cupy_module = types.SimpleNamespace(
+    asarray=_asarray,
+    linalg=types.SimpleNamespace(svd=_device_function(np.linalg.svd)),
+    **{
+        name: _device_function(getattr(np, name))
+        for name in (
+            "ascontiguousarray", "concatenate", "conj", "count_nonzero",
+            "cumsum", "ones", "reshape", "split", "sqrt", "square",
+            "tensordot", "transpose", "zeros",
+        )
+    }
+)
+
+
+@pytest.fixture
+def fake_cupy(monkeypatch):
+    """Makes the "cupy" backend use a mock GPU array module of DeviceArrays,
+    so that it is tested without a GPU or CuPy installed.
+    """
+    array_module = mpsim.core._array_module
+
+    def fake_array_module(backend: str):
+        if backend == "cupy":
+            return fake_cupy_module
+        return array_module(backend)
+
+    monkeypatch.setattr(mpsim.core, "_array_module", fake_array_module)
+    return fake_cupy_module
@@ -1,9 +1,16 @@
 """Defines matrix product state class."""
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
-from typing import Dict, List, Optional, Sequence, Tuple, Union
+from functools import lru_cache
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
 
 import numpy as np
+import opt_einsum as oe
+from scipy.linalg.lapack import get_lapack_funcs
 import tensornetwork as tn
 
 from mpsim.gates import (
@@ -20,6 +27,10 @@ class CannotConvertToMPSOperation(Exception):
 
 class MPSOperation:
     """Defines an operation which can act on a matrix product state."""
+    # Operations are created for every gate (and resolver of a sweep), so
+    # they don't have an instance dictionary
+    __slots__ = ("_node", "_qudit_indices", "_qudit_dimension")
+
     def __init__(
         self,
         node: tn.Node,
@@ -110,6 +121,19 @@ class MPSOperation:
             )
         return tensor
 
+    def schedule_entry(self) -> Tuple[int, int, int, tn.Node]:
+        """Returns the tuple (num_qudits, index1, index2, gate) which applies
+        the MPS Operation in MPS.apply_schedule.
+
+        The gate is the node of the MPS Operation, not a copy.
+        """
+        return (
+            len(self._qudit_indices),
+            self._qudit_indices[0],
+            self._qudit_indices[-1],
+            self._node,
+        )
+
     def is_valid(self) -> bool:
         """Returns True if the MPS Operation is valid, else False.
 
@@ -156,15 +180,235 @@ class MPSOperation:
         return f"Tensor {self._node.name} on qudit(s) {self._qudit_indices}."
 
 
+def _array_module(backend: str):
+    """Returns the array module (numpy or cupy) for the backend.
+
+    Args:
+        backend: Either "numpy" for tensors on the CPU or "cupy" for tensors
+            on a CUDA GPU, which requires CuPy to be installed.
+
+    Raises:
+        ValueError: If the backend is not supported.
+        ImportError: If the backend is "cupy" and CuPy is not installed.
+    """
+    if backend == "numpy":
+        return np
+    if backend == "cupy":
+        try:
+            import cupy
+        except ImportError:
+            raise ImportError(
+                "The cupy backend requires CuPy to be installed."
+            )
+        return cupy
+    raise ValueError(
+        f"Backend should be 'numpy' or 'cupy' but is {backend}."
+    )
+
+
+def _to_numpy(array) -> np.ndarray:
+    """Returns the array as a numpy array, copying it to the host if it is
+    stored on a GPU.
+    """
+    if isinstance(array, np.ndarray):
+        return array
+    return array.get()
+
+
+@lru_cache(maxsize=64)
+def _gesdd(dtype: np.dtype, nrows: int, ncols: int) -> Tuple[Callable, int]:
+    """Returns the LAPACK gesdd routine for the dtype along with the optimal
+    workspace size for an nrows x ncols matrix.
+
+    Args:
+        dtype: Data type of the matrix.
+        nrows: Number of rows in the matrix.
+        ncols: Number of columns in the matrix.
+    """
+    gesdd, gesdd_lwork = get_lapack_funcs(
+        ("gesdd", "gesdd_lwork"), dtype=dtype
+    )
+    work, info = gesdd_lwork(nrows, ncols, compute_uv=1, full_matrices=0)
+    if info != 0:
+        raise np.linalg.LinAlgError(
+            f"SVD workspace query failed with info = {info}."
+        )
+    # In single precision, the workspace size may be rounded down
+    lwork = np.real(work)
+    if np.dtype(dtype).char in "fF":
+        lwork = np.nextafter(np.float32(lwork), np.float32(np.inf))
+    return gesdd, max(1, int(np.ceil(lwork)))
+
+
+# Smallest matrix dimension for which a randomized SVD is used
+_RANDOMIZED_SVD_MIN_DIMENSION = 64
+
+
+def _svd(
+    matrix: np.ndarray,
+    max_singular_values: Optional[int] = None,
+    max_truncation_error: Optional[float] = None,
+    randomized: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the (truncated) singular value decomposition U, S, Vdag of the
+    matrix along with the vector of truncated singular values.
+
+    The truncation follows tn.split_node_full_svd: If both max_singular_values
+    and max_truncation_error are provided, max_singular_values takes priority.
+
+    Args:
+        matrix: Matrix to decompose.
+        max_singular_values: Maximum number of singular values to keep.
+            If None, all singular values are kept.
+        max_truncation_error: Maximum 2-norm of the truncated singular values.
+        randomized: If True and only a few singular values of a large numpy
+            matrix are kept, they are computed by a randomized SVD (see
+            _randomized_svd). This is faster but only approximate. Default is
+            False for the exact SVD.
+
+    Notes:
+        Matrices which are not numpy arrays (i.e., CuPy arrays on a GPU) are
+        decomposed on their device by the linalg.svd of their array module.
+
+        For a randomized SVD, the returned vector of truncated singular values
+        has a single entry equal to the 2-norm of all truncated singular
+        values.
+
+    Raises:
+        np.linalg.LinAlgError: If the SVD does not converge.
+    """
+    if (randomized
+            and isinstance(matrix, np.ndarray)
+            and max_singular_values is not None
+            and max_truncation_error is None
+            and min(matrix.shape) >= _RANDOMIZED_SVD_MIN_DIMENSION
+            and 0 < max_singular_values < 0.25 * min(matrix.shape)):
+        return _randomized_svd(matrix, max_singular_values)
+
+    if isinstance(matrix, np.ndarray):
+        xp = np
+        gesdd, lwork = _gesdd(matrix.dtype, *matrix.shape)
+        u, s, vdag, info = gesdd(
+            matrix, compute_uv=1, full_matrices=0, lwork=lwork
+        )
+        if info != 0:
+            raise np.linalg.LinAlgError(f"SVD failed with info = {info}.")
+    else:
+        xp = _array_module("cupy")
+        u, s, vdag = xp.linalg.svd(matrix, full_matrices=False)
+
+    if max_singular_values is None:
+        max_singular_values = s.size
+    keep = min(max_singular_values, s.size)
+    if max_truncation_error is not None:
+        truncation_errors = xp.sqrt(xp.cumsum(xp.square(s[::-1])))
+        keep = min(
+            keep,
+            int(xp.count_nonzero(truncation_errors > max_truncation_error))
+        )
+    return u[:, :keep], s[:keep], vdag[:keep, :], s[keep:]
+
+
+@lru_cache(maxsize=64)
+def _test_matrix(ncols: int, rank: int, dtype: np.dtype) -> np.ndarray:
+    """Returns the (read-only) Gaussian random test matrix of a randomized
+    SVD, which is drawn once for each shape and dtype.
+
+    Args:
+        ncols: Number of columns in the matrix to decompose.
+        rank: Number of columns in the test matrix.
+        dtype: Data type of the matrix to decompose.
+    """
+    rng = np.random.RandomState(ncols * rank)
+    omega = rng.randn(ncols, rank).astype(dtype)
+    omega.setflags(write=False)
+    return omega
+
+
+def _randomized_svd(
+    matrix: np.ndarray, rank: int, oversamples: int = 10, niter: int = 4
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the rank-k truncated SVD U, S, Vdag of the matrix computed by
+    the randomized range finder with power iterations of
+    https://arxiv.org/abs/0909.4061 along with the 2-norm of the truncated
+    singular values as a vector with one entry.
+
+    Args:
+        matrix: Matrix to decompose.
+        rank: Number of singular values to keep.
+        oversamples: Number of extra samples of the range of the matrix.
+        niter: Number of power iterations.
+    """
+    nsamples = min(rank + oversamples, *matrix.shape)
+
+    # Find an orthonormal basis Q for the range of the matrix
+    q, _ = np.linalg.qr(
+        matrix @ _test_matrix(matrix.shape[1], nsamples, matrix.dtype)
+    )
+    for _ in range(niter):
+        q, _ = np.linalg.qr(matrix.conj().T @ q)
+        q, _ = np.linalg.qr(matrix @ q)
+
+    # Do the SVD of the small matrix Q^dag M
+    u, s, vdag, _ = _svd(q.conj().T @ matrix)
+    u = q @ u[:, :rank]
+    s = s[:rank]
+    vdag = vdag[:rank, :]
+
+    # The truncated weight is the part of the Frobenius norm not kept
+    truncated_weight = np.linalg.norm(matrix) ** 2 - np.sum(s ** 2)
+    truncated = np.sqrt([max(truncated_weight, 0.0)]).astype(s.dtype)
+    return u, s, vdag, truncated
+
+
+@lru_cache(maxsize=256)
+def _contract_expression(
+    subscripts: str, *shapes: Tuple[int, ...]
+) -> Callable[..., np.ndarray]:
+    """Returns the opt_einsum contraction expression for the einsum subscripts
+    and tensor shapes.
+
+    The contraction path is computed once for each set of subscripts and
+    shapes, then reused by every MPS (including copies) on subsequent calls.
+    """
+    return oe.contract_expression(subscripts, *shapes, optimize="auto-hq")
+
+
+# Per-tensor kernels on (free, left connected, right connected) tensors.
+# These are written as reshapes and matrix products, which have far less call
+# overhead than einsum or tensordot for the small tensors of typical circuits.
+# Only array methods and operators are used, so the kernels run on the array
+# module (numpy or cupy) of the tensors.
+def _apply_one_qudit(gate: np.ndarray, tensor: np.ndarray) -> np.ndarray:
+    """Returns the tensor after contracting gate edge 1 with its free edge."""
+    d, left, right = tensor.shape
+    new = gate @ tensor.reshape(d, left * right)
+    return new.reshape(gate.shape[0], left, right)
+
+
+def _norm_step(env: np.ndarray, tensor: np.ndarray) -> np.ndarray:
+    """Returns the (right bond x right bond) environment obtained by
+    contracting the (left bond x left bond) environment with the tensor and
+    its conjugate.
+    """
+    d, left, right = tensor.shape
+    new = (env.T @ tensor).reshape(d * left, right)
+    return new.T @ tensor.conj().reshape(d * left, right)
+
+
 class MPS:
     """Matrix Product State (MPS) object."""
     def __init__(
         self,
         nqudits: int,
         qudit_dimension: int = 2,
-        tensor_prefix: str = "q"
+        tensor_prefix: str = "q",
+        backend: str = "numpy",
+        state: int = 0,
+        dtype: Optional[np.dtype] = None,
     ) -> None:
-        """Initializes an MPS of qudits in the ground (all-zero) state.
+        """Initializes an MPS of qudits in a computational basis state, by
+        default the ground (all-zero) state.
 
         The MPS has the following structure (shown for six qudits):
 
@@ -180,74 +424,83 @@ class MPS:
             tensor_prefix: Prefix for tensor names.
                 The full name is prefix + numerical index, numbered from
                 left to right starting with zero.
+            backend: Array backend which stores the tensors and applies gates.
+                Either "numpy" (default) or "cupy" to keep the tensors on a
+                CUDA GPU. Methods returning arrays (e.g., wavefunction) and
+                nodes always return them on the host.
+            state: Integer label of the computational basis state. The base
+                qudit_dimension digits of state are the states of the qudits,
+                with qudit zero as the most significant digit (as in Cirq).
+                Default is zero for the ground state.
+            dtype: Data type of the tensors. By default, the initial tensors
+                are complex64 and gates promote them to the data type of the
+                gates, e.g. complex128 for CNOT and for the SWAP gates which
+                apply nonlocal gates. If provided, SWAP gates are applied in
+                this data type, so the tensors keep it if all gates have it.
+
+        Raises:
+            ValueError: If nqudits < 2 or state is not between zero and
+                qudit_dimension ** nqudits - 1.
         """
         if nqudits < 2:
             raise ValueError(
                 f"Number of qudits must be greater than 2 but is {nqudits}."
             )
 
-        # Set nodes on the interior
-        nodes = [
-            tn.Node(
-                np.array(
-                    [[[1.0]], *[[[0]]] * (qudit_dimension - 1)],
-                    dtype=np.complex64
-                ),
-                name=tensor_prefix + str(i + 1),
+        if not (0 <= state < qudit_dimension ** nqudits):
+            raise ValueError(
+                f"Argument state should be between 0 and "
+                f"{qudit_dimension ** nqudits - 1} but is {state}."
             )
-            for i in range(nqudits - 2)
-        ]
 
-        # Set nodes on the left and right edges
-        nodes.insert(
-            0,
-            tn.Node(
-                np.array(
-                    [[1.0], *[[0]] * (qudit_dimension - 1)], dtype=np.complex64
-                ),
-                name=tensor_prefix + str(0),
-            ),
-        )
-        nodes.append(
-            tn.Node(
-                np.array(
-                    [[1.0], *[[0]] * (qudit_dimension - 1)], dtype=np.complex64
-                ),
-                name=tensor_prefix + str(nqudits - 1),
+        # Set the tensors with axes (free, left connected, right connected).
+        # The left-most and right-most tensors have a trivial left and right
+        # connected edge, respectively. Tensors of qudits in the same state
+        # share the same (read-only) array since tensors of the MPS are
+        # replaced, never modified in place.
+        xp = _array_module(backend)
+        digits = []
+        for _ in range(nqudits):
+            state, digit = divmod(state, qudit_dimension)
+            digits.append(digit)
+        digits.reverse()
+        basis_states = {}
+        for digit in set(digits):
+            basis_state = xp.zeros(
+                (qudit_dimension, 1, 1),
+                dtype=np.complex64 if dtype is None else dtype
             )
-        )
-
-        # Connect edges between interior nodes
-        for i in range(1, nqudits - 2):
-            tn.connect(nodes[i].get_edge(2), nodes[i + 1].get_edge(1))
-
-        # Connect edge nodes to their neighbors
-        if nqudits < 3:
-            tn.connect(nodes[0].get_edge(1), nodes[1].get_edge(1))
-        else:
-            tn.connect(nodes[0].get_edge(1), nodes[1].get_edge(1))
-            tn.connect(nodes[-1].get_edge(1), nodes[-2].get_edge(2))
+            basis_state[digit, 0, 0] = 1.0
+            if isinstance(basis_state, np.ndarray):
+                basis_state.setflags(write=False)
+            basis_states[digit] = basis_state
+        tensors = [basis_states[digit] for digit in digits]
 
         self._nqudits = nqudits
         self._qudit_dimension = qudit_dimension
         self._prefix = tensor_prefix
-        self._nodes = nodes
+        self._backend = backend
+        self._xp = xp
+        self._dtype = dtype
+        self._tensors = tensors
+        self._names = [tensor_prefix + str(i) for i in range(nqudits)]
+        self._node_cache = None  # type: Optional[List[tn.Node]]
+        # The maximum bond dimension at each cut is the smaller of the Hilbert
+        # space dimensions on either side of the cut
         self._max_bond_dimensions = [
-            self._qudit_dimension ** (i + 1) for i in range(self._nqudits // 2)
+            self._qudit_dimension ** min(i + 1, self._nqudits - 1 - i)
+            for i in range(self._nqudits - 1)
         ]
-        self._max_bond_dimensions += list(reversed(self._max_bond_dimensions))
-        if self._nqudits % 2 == 0:
-            self._max_bond_dimensions.remove(
-                self._qudit_dimension ** (self._nqudits // 2)
-            )
         self._norms = []  # type: List[float]
+        self._skip_validation = False
 
     @staticmethod
     def from_wavefunction(
         wavefunction: np.ndarray,
         nqudits: int,
         qudit_dimension: int = 2,
-        tensor_prefix: str = "q"
+        tensor_prefix: str = "q",
+        backend: str = "numpy"
     ) -> 'MPS':
         """Returns an MPS constructed from the initial wavefunction.
 
@@ -258,6 +511,7 @@ class MPS:
             tensor_prefix: Prefix for tensor names.
                 The full name is prefix + numerical index, numbered from
                 left to right starting with zero.
+            backend: Array backend of the MPS. See MPS.__init__.
 
         Raises:
             TypeError: Wavefunction is not a numpy.ndarray or cannot be
@@ -288,43 +542,31 @@ class MPS:
                 f"elements."
             )
 
-        # Reshape the wavefunction
-        wavefunction = np.reshape(
-            wavefunction, newshape=[qudit_dimension] * nqudits
-        )
-        to_split = tn.Node(
-            wavefunction, axis_names=[str(i) for i in range(nqudits)]
-        )
-
-        # Perform SVD across each cut
-        nodes = []
-        for i in range(nqudits - 1):
-            left_edges = []
-            right_edges = []
-            for edge in to_split.get_all_dangling():
-                if edge.name == str(i):
-                    left_edges.append(edge)
-                else:
-                    right_edges.append(edge)
-            if nodes:
-                for edge in nodes[-1].get_all_nondangling():
-                    if to_split in edge.get_nodes():
-                        left_edges.append(edge)
-
-            left_node, right_node, _ = tn.split_node(
-                to_split,
-                left_edges,
-                right_edges,
-                left_name=tensor_prefix + str(i)
+        if wavefunction.dtype.kind in "biu":
+            wavefunction = wavefunction.astype(np.float64)
+
+        # Perform SVD across each cut, splitting the singular values evenly
+        # between the left and right tensors
+        tensors = []
+        rest = np.reshape(wavefunction, newshape=(1, wavefunction.size))
+        for _ in range(nqudits - 1):
+            bond = rest.shape[0]
+            u, s, vdag, _ = _svd(
+                np.reshape(rest, newshape=(bond * qudit_dimension, -1))
             )
-            nodes.append(left_node)
-            to_split = right_node
-        to_split.name = tensor_prefix + str(nqudits - 1)
-        nodes.append(to_split)
-
-        # Return the MPS
-        mps = MPS(nqudits, qudit_dimension, tensor_prefix)
-        mps._nodes = nodes
+            sqrt_s = np.sqrt(s).astype(u.dtype)
+            left = np.reshape(u * sqrt_s, newshape=(bond, qudit_dimension, -1))
+            tensors.append(np.transpose(left, (1, 0, 2)))
+            rest = np.reshape(sqrt_s, newshape=(-1, 1)) * vdag
+        last = np.reshape(rest, newshape=(-1, qudit_dimension, 1))
+        tensors.append(np.transpose(last, (1, 0, 2)))
+
+        # Return the MPS, storing the transposed tensors contiguously on the
+        # device of the backend
+        mps = MPS(nqudits, qudit_dimension, tensor_prefix, backend)
+        mps._tensors = [
+            mps._xp.asarray(tensor, order="C") for tensor in tensors
+        ]
         return mps
 
     @property
@@ -354,16 +596,18 @@ class MPS:
                 f"Index should be less than {self._nqudits} but is {node_index}."
             )
 
-        left = self.get_node(node_index, copy=False)
-        right = self.get_node(node_index + 1, copy=False)
-        tn.check_connected((left, right))
-        edge = tn.get_shared_edges(left, right).pop()
-        return edge.dimension
+        return self._tensors[node_index].shape[2]
 
     def bond_dimensions(self) -> List[int]:
         """Returns the bond dimension of each edge in the MPS."""
         return [self.bond_dimension_of(i) for i in range(self._nqudits - 1)]
 
+    def norms(self) -> List[float]:
+        """Returns the norms of the MPS stored after two qudit gates applied
+        with the keyword argument track_norms=True.
+        """
+        return self._norms
+
     def max_bond_dimension_of(self, edge_index: int) -> int:
         """Returns the maximum bond dimension of the right edge
         of the node at the given index.
@@ -390,65 +634,135 @@ class MPS:
 
         A valid MPS satisfies the following criteria:
             (1) At least two tensors.
-            (2) Every tensor has exactly one free (dangling) edge.
-            (3) Every tensor has connected edges to its nearest neighbor(s).
+            (2) Every tensor has one free edge of dimension qudit_dimension,
+                a left connected edge, and a right connected edge. The left
+                (right) connected edge of the left-most (right-most) tensor
+                has dimension one.
+            (3) Every tensor has connected edges of the same dimension as its
+                nearest neighbor(s).
         """
-        if len(self._nodes) < 2:
+        if len(self._tensors) < 2:
             return False
 
-        for (i, tensor) in enumerate(self._nodes):
+        for (i, tensor) in enumerate(self._tensors):
+            if tensor.ndim != 3 or tensor.shape[0] != self._qudit_dimension:
+                return False
+
             # Exterior nodes
-            if i == 0 or i == len(self._nodes) - 1:
-                if len(tensor.get_all_dangling()) != 1:
-                    return False
-                if len(tensor.get_all_nondangling()) != 1:
-                    return False
-            # Interior nodes
-            else:
-                if len(tensor.get_all_dangling()) != 1:
-                    return False
-                if len(tensor.get_all_nondangling()) != 2:
-                    return False
+            if i == 0 and tensor.shape[1] != 1:
+                return False
+            if i == len(self._tensors) - 1 and tensor.shape[2] != 1:
+                return False
 
-            if i < len(self._nodes) - 1:
-                try:
-                    tn.check_connected((self._nodes[i], self._nodes[i + 1]))
-                except ValueError:
+            if i < len(self._tensors) - 1:
+                if tensor.shape[2] != self._tensors[i + 1].shape[1]:
                     print(f"Nodes at index {i} and {i + 1} are not connected.")
                     return False
         return True
 
+    @contextmanager
+    def no_validation(self) -> Iterator['MPS']:
+        """Context manager in which gates are applied without first checking
+        that the MPS is valid.
+
+        Example:
+            >>> mps = MPS(nqudits=10)
+            >>> with mps.no_validation():
+            ...     for i in range(9):
+            ...         mps.cnot(i, i + 1)
+        """
+        skip_validation = self._skip_validation
+        self._skip_validation = True
+        try:
+            yield self
+        finally:
+            self._skip_validation = skip_validation
+
+    @property
+    def _nodes(self) -> List[tn.Node]:
+        """Returns the network of connected nodes of the MPS.
+
+        The network is built from the tensors of the MPS when first needed and
+        reused until a tensor of the MPS changes.
+        """
+        if self._node_cache is None:
+            self._node_cache = self._build_nodes()
+        return self._node_cache
+
+    def _build_nodes(self) -> List[tn.Node]:
+        """Returns a new network of connected nodes from the tensors of the MPS.
+
+        Interior nodes have edges (free, left connected, right connected).
+        The left-most node has edges (free, right connected) and the
+        right-most node has edges (free, left connected).
+        """
+        nodes = [self._build_node(i) for i in range(self._nqudits)]
+
+        # Connect edges between interior nodes
+        for i in range(1, self._nqudits - 2):
+            tn.connect(nodes[i].get_edge(2), nodes[i + 1].get_edge(1))
+
+        # Connect edge nodes to their neighbors
+        tn.connect(nodes[0].get_edge(1), nodes[1].get_edge(1))
+        if self._nqudits > 2:
+            tn.connect(nodes[-1].get_edge(1), nodes[-2].get_edge(2))
+        return nodes
+
+    def _build_node(self, node_index: int) -> tn.Node:
+        """Returns a new node for the tensor at the given index with edges
+        ordered as in MPS._build_nodes. The edges of the node are not connected.
+
+        Args:
+            node_index: Index of the tensor.
+        """
+        tensor = _to_numpy(self._tensors[node_index])
+        if node_index == 0:
+            tensor = tensor[:, 0, :]
+        elif node_index == self._nqudits - 1:
+            tensor = tensor[:, :, 0]
+        return tn.Node(tensor, name=self._names[node_index])
+
     def get_nodes(self, copy: bool = True) -> List[tn.Node]:
         """Returns the nodes of the MPS.
 
+        The MPS stores its tensors as arrays, and nodes are a view built from
+        these tensors. Modifying or connecting the returned nodes therefore
+        does not change the MPS.
+
         Args:
-            copy: If True, a copy of the nodes are returned, else the actual
-                nodes are returned.
+            copy: If True, a new network of connected nodes is returned. If
+                False, the network cached by the MPS is returned. It is shared
+                between calls and rebuilt after the next gate changes a tensor.
         """
         if not copy:
             return self._nodes
-        nodes_dict, _ = tn.copy(self._nodes)
-        return list(nodes_dict.values())
+        return self._build_nodes()
 
     def get_node(self, node_index: int, copy: bool = True) -> tn.Node:
         """Returns the ith node in the MPS counting from the left.
 
         Args:
             node_index: Index of node to get.
-            copy: If true, a copy of the node is returned,
-                else the actual node is returned.
+            copy: If true, a new node is returned whose edges are not connected
+                to any other node. If False, the node is taken from the cached
+                network of connected nodes (see MPS.get_nodes). In both cases,
+                modifying the node does not change the MPS.
         """
-        return self.get_nodes(copy)[node_index]
+        if not copy:
+            return self._nodes[node_index]
+        return self._build_node(range(self._nqudits)[node_index])
 
     def get_free_edge_of(self, node_index: int, copy: bool = True) -> tn.Edge:
         """Returns the free (dangling) edge of a node with specified index.
         
         Args:
             node_index: Specifies the node.
-            copy: If True, returns a copy of the edge.
-                If False, returns the actual edge.
+            copy: If True, returns the edge of a new node.
+                If False, returns the edge of the cached node
+                (see MPS.get_node).
         """
-        return self.get_node(node_index, copy).get_all_dangling().pop()
+        # The free edge is the first edge of every node
+        return self.get_node(node_index, copy).get_edge(0)
 
     def get_left_connected_edge_of(
             self, node_index: int
@@ -480,29 +794,54 @@ class MPS:
             self._nodes[node_index], self._nodes[node_index + 1]
         ).pop()
 
+    def _set_site_tensor(self, node_index: int, tensor: np.ndarray) -> None:
+        """Sets the tensor at the given index of the MPS.
+
+        Args:
+            node_index: Index of the tensor.
+            tensor: New tensor with axes ordered as (free, left connected,
+                right connected).
+        """
+        self._tensors[node_index] = tensor
+        self._node_cache = None
+
+    @staticmethod
+    def _contract(subscripts: str, *tensors: np.ndarray) -> np.ndarray:
+        """Returns the contraction of the tensors specified by the einsum
+        subscripts, using the contraction path cached by _contract_expression.
+
+        Args:
+            subscripts: Einsum subscripts, e.g. "ab,bc->ac".
+            tensors: Tensors to contract.
+        """
+        expression = _contract_expression(
+            subscripts, *[tensor.shape for tensor in tensors]
+        )
+        return expression(*tensors)
+
     def wavefunction(self) -> np.array:
         """Returns the wavefunction of the MPS as a vector."""
         if not self.is_valid():
             raise ValueError("MPS is not valid.")
 
-        # Replicate the mps
-        nodes = self.get_nodes(copy=True)
-        fin = nodes.pop(0)
-        for node in nodes:
-            fin = tn.contract_between(fin, node)
-
-        # Make sure all edges are free
-        if set(fin.get_all_dangling()) != set(fin.get_all_edges()):
-            raise ValueError("Invalid MPS.")
+        # Label the free and connected edges with einsum indices
+        n = self._nqudits
+        free = [oe.get_symbol(i) for i in range(n)]
+        connected = [oe.get_symbol(n + i) for i in range(n + 1)]
+        inputs = [free[i] + connected[i] + connected[i + 1] for i in range(n)]
 
+        # Contract the entire MPS in one step
+        fin = self._contract(
+            ",".join(inputs) + "->" + "".join(free), *self._tensors
+        )
         return np.reshape(
-            fin.tensor, newshape=(self._qudit_dimension ** self._nqudits)
+            _to_numpy(fin), newshape=(self._qudit_dimension ** self._nqudits)
         )
 
     def dagger(self):
         """Takes the dagger (conjugate transpose) of the MPS."""
         for i in range(self._nqudits):
-            self._nodes[i].set_tensor(np.conj(self._nodes[i].tensor))
+            self._set_site_tensor(i, self._xp.conj(self._tensors[i]))
 
     def inner_product(self, other: 'MPS') -> np.complex:
         """Returns the inner product between self and other computed by
@@ -561,8 +900,21 @@ class MPS:
         return np.complex(fin.tensor)
 
     def norm(self) -> float:
-        """Returns the norm of the MPS computed by contraction."""
-        return np.sqrt(self.inner_product(self).real)
+        """Returns the norm of the MPS computed by contraction.
+
+        The contraction sweeps from left to right, keeping only the (bond x
+        bond) environment of the tensors contracted so far.
+
+        Raises:
+            ValueError: If the MPS is not valid.
+        """
+        if not self._skip_validation and not self.is_valid():
+            raise ValueError("MPS is not valid.")
+
+        env = self._xp.ones((1, 1))
+        for tensor in self._tensors:
+            env = _norm_step(env, tensor)
+        return float(np.sqrt(float(env[0, 0].real)))
 
     def renormalize(self, to_norm: float = 1.0) -> None:
         """Renormalizes the MPS.
@@ -588,9 +940,9 @@ class MPS:
             )
 
         norm = self.norm()
-        for i, node in enumerate(self._nodes):
-            self._nodes[i].set_tensor(
-                (to_norm / norm)**(1 / self.nqudits) * node.tensor
+        for i, tensor in enumerate(self._tensors):
+            self._set_site_tensor(
+                i, (to_norm / norm)**(1 / self.nqudits) * tensor
             )
 
     def reduced_density_matrix(
@@ -619,11 +971,12 @@ class MPS:
         if min(node_indices) < 0 or max(node_indices) > self._nqudits - 1:
             raise IndexError("One or more invalid node indices.")
 
-        ket = self.copy()
-        bra = self.copy()
-        bra.dagger()
-        ket_edges = [node.get_all_dangling().pop() for node in ket._nodes]
-        bra_edges = [node.get_all_dangling().pop() for node in bra._nodes]
+        ket_nodes = self.get_nodes(copy=True)
+        bra_nodes = self.get_nodes(copy=True)
+        for node in bra_nodes:
+            node.set_tensor(np.conj(node.tensor))
+        ket_edges = [node.get_all_dangling().pop() for node in ket_nodes]
+        bra_edges = [node.get_all_dangling().pop() for node in bra_nodes]
 
         # Store ordered free edges to reorder edges in the final tensor
         ket_free_edges = []
@@ -639,12 +992,12 @@ class MPS:
 
             # Contract while allowing outer product for unconnected nodes
             mid = tn.contract_between(
-                ket._nodes[i], bra._nodes[i], allow_outer_product=True
+                ket_nodes[i], bra_nodes[i], allow_outer_product=True
             )
 
             if i < self._nqudits - 1:
-                new = tn.contract_between(mid, ket._nodes[i + 1])
-                ket._nodes[i + 1] = new
+                new = tn.contract_between(mid, ket_nodes[i + 1])
+                ket_nodes[i + 1] = new
 
         mid.reorder_edges(ket_free_edges + bra_free_edges)
         n = len(node_indices)
@@ -661,7 +1014,7 @@ class MPS:
         """
         string = []
         states = list(range(self._qudit_dimension))
-        copy = self.copy()
+        nodes = self.get_nodes(copy=True)
         for i in range(self._nqudits):
             qubit = self.reduced_density_matrix(i).diagonal().real
             string.append(np.random.choice(states, size=1, p=qubit)[0])
@@ -669,13 +1022,13 @@ class MPS:
                 string[-1], dim=self._qudit_dimension
             )
             edge = tn.connect(
-                copy._nodes[i].get_all_dangling().pop(),
+                nodes[i].get_all_dangling().pop(),
                 state.get_all_dangling().pop()
             )
             mid = tn.contract(edge)
             if i < self._nqudits - 1:
-                new = tn.contract_between(mid, copy._nodes[i + 1])
-                copy._nodes[i + 1] = new
+                new = tn.contract_between(mid, nodes[i + 1])
+                nodes[i + 1] = new
 
         if as_string:
             return "".join(str(bit) for bit in string)
@@ -750,6 +1103,29 @@ class MPS:
         mps_copy.apply(observable)
         return self.inner_product(mps_copy).real
 
+    def _check_one_qudit_gate(self, gate: tn.Node) -> None:
+        """Raises a ValueError if the gate is not a valid single qudit gate
+        for the MPS.
+
+        Args:
+            gate: Single qudit gate to check.
+        """
+        if (len(gate.get_all_dangling()) != 2
+                or len(gate.get_all_nondangling()) != 0):
+            raise ValueError(
+                "Single qudit gate must have two free edges"
+                " and zero connected edges."
+            )
+
+        if gate.get_edge(0).dimension != gate.get_edge(1).dimension:
+            raise ValueError("Gate edge dimensions must be equal.")
+
+        if gate.get_edge(0).dimension != self._qudit_dimension:
+            raise ValueError(
+                f"Gate edges have dimension {gate.get_edge(0).dimension} "
+                f"but should have MPS qudit dimension = {self._qudit_dimension}"
+            )
+
     def apply_one_qudit_gate(
         self,
         gate: tn.Node,
@@ -779,7 +1155,7 @@ class MPS:
                 On invalid MPS, invalid index, invalid gate, and edge dimension
                 mismatch between gate edges and MPS qudit edges.
         """
-        if not self.is_valid():
+        if not self._skip_validation and not self.is_valid():
             raise ValueError("MPS is invalid.")
 
         if node_index not in range(self._nqudits):
@@ -788,21 +1164,7 @@ class MPS:
                 f" an MPS on {self._nqudits} qudits."
             )
 
-        if (len(gate.get_all_dangling()) != 2
-                or len(gate.get_all_nondangling()) != 0):
-            raise ValueError(
-                "Single qudit gate must have two free edges"
-                " and zero connected edges."
-            )
-
-        if gate.get_edge(0).dimension != gate.get_edge(1).dimension:
-            raise ValueError("Gate edge dimensions must be equal.")
-
-        if gate.get_edge(0).dimension != self._qudit_dimension:
-            raise ValueError(
-                f"Gate edges have dimension {gate.get_edge(0).dimension} "
-                f"but should have MPS qudit dimension = {self._qudit_dimension}"
-            )
+        self._check_one_qudit_gate(gate)
 
         # Parse the keyword arguments
         renormalize_after_non_unitary = True
@@ -813,20 +1175,18 @@ class MPS:
             ortho_after_non_unitary = False
 
         # Store the norm for optional renormalization after non-unitary gate
-        if not is_unitary(gate) and renormalize_after_non_unitary:
+        unitary = is_unitary(gate)
+        if not unitary and renormalize_after_non_unitary:
             norm = self.norm()
 
-        # Connect the MPS and gate edges
-        mps_edge = list(self._nodes[node_index].get_all_dangling())[0]
-        gate_edge = gate[1]
-        connected = tn.connect(mps_edge, gate_edge)
-
-        # Contract the edge to get the new tensor
-        new = tn.contract(connected, name=self._nodes[node_index].name)
-        self._nodes[node_index] = new
+        # Contract gate edge 1 with the free edge of the MPS tensor
+        new = _apply_one_qudit(
+            self._xp.asarray(gate.tensor), self._tensors[node_index]
+        )
+        self._set_site_tensor(node_index, new)
 
         # Optional orthonormalization after a non-unitary gate
-        if not is_unitary(gate) and ortho_after_non_unitary:
+        if not unitary and ortho_after_non_unitary:
             # Edge case: Left-most node
             if node_index == 0:
                 self.orthonormalize_right_edge_of(node_index)
@@ -841,7 +1201,7 @@ class MPS:
                 self.orthonormalize_left_edge_of(node_index)
 
         # Optional renormalization after non-unitary gate
-        if not is_unitary(gate) and renormalize_after_non_unitary:
+        if not unitary and renormalize_after_non_unitary:
             self.renormalize(norm)
 
     def orthonormalize_right_edge_of(
@@ -864,32 +1224,25 @@ class MPS:
         if not 0 <= node_index < self._nqudits - 1:
             raise ValueError("Invalid edge index.")
 
-        # Get the node
-        node = self._nodes[node_index]
-
-        # Get the left and right edges to do the SVD
-        left_edges = [self.get_free_edge_of(node_index, copy=False)]
-        if self.get_left_connected_edge_of(node_index):
-            left_edges.append(self.get_left_connected_edge_of(node_index))
-        right_edges = [self.get_right_connected_edge_of(node_index)]
-
-        # Do the SVD
-        u, s, vdag, _ = tn.split_node_full_svd(
-            node,
-            left_edges=left_edges,
-            right_edges=right_edges,
-            max_truncation_err=threshold * self.norm(),
+        # Do the SVD with the free and left edges grouped
+        tensor = self._tensors[node_index]
+        d, left, right = tensor.shape
+        u, s, vdag, _ = _svd(
+            self._xp.reshape(tensor, (d * left, right)),
+            max_truncation_error=threshold * self.norm(),
         )
 
         # Set the new node
-        self._nodes[node_index] = u
-        self._nodes[node_index].name = self._prefix + str(node_index)
+        self._set_site_tensor(
+            node_index, self._xp.reshape(u, (d, left, s.size))
+        )
 
         # Mutlipy S and Vdag to the right
-        temp = tn.contract_between(s, vdag)
-        new_right = tn.contract_between(temp, self._nodes[node_index + 1])
-        new_right.name = self._nodes[node_index + 1].name
-        self._nodes[node_index + 1] = new_right
+        temp = self._xp.reshape(s, (s.size, 1)) * vdag
+        new_right = self._contract(
+            "ab,pbr->par", temp, self._tensors[node_index + 1]
+        )
+        self._set_site_tensor(node_index + 1, new_right)
 
     def orthonormalize_left_edge_of(
             self, node_index: int, threshold: float = 1e-8
@@ -911,41 +1264,66 @@ class MPS:
         if not 0 < node_index <= self._nqudits - 1:
             raise ValueError("Invalid edge index.")
 
-        # Get the node
-        node = self._nodes[node_index]
-
-        # Get the left and right edges to do the SVD
-        left_edges = [self.get_left_connected_edge_of(node_index)]
-        right_edges = [self.get_free_edge_of(node_index, copy=False)]
-        if self.get_right_connected_edge_of(node_index):
-            right_edges.append(self.get_right_connected_edge_of(node_index))
-
-        # Do the SVD
-        u, s, vdag, _ = tn.split_node_full_svd(
-            node,
-            left_edges=left_edges,
-            right_edges=right_edges,
-            max_truncation_err=threshold * self.norm(),
+        # Do the SVD with the free and right edges grouped
+        tensor = self._tensors[node_index]
+        d, left, right = tensor.shape
+        u, s, vdag, _ = _svd(
+            self._xp.reshape(
+                self._xp.transpose(tensor, (1, 0, 2)), (left, d * right)
+            ),
+            max_truncation_error=threshold * self.norm(),
         )
 
         # Set the new node
-        self._nodes[node_index] = vdag
-        self._nodes[node_index].name = self._prefix + str(node_index)
+        vdag = self._xp.reshape(vdag, (s.size, d, right))
+        self._set_site_tensor(
+            node_index,
+            self._xp.ascontiguousarray(self._xp.transpose(vdag, (1, 0, 2)))
+        )
 
         # Mutlipy U and S to the left
-        temp = tn.contract_between(u, s)
-        new_left = tn.contract_between(self._nodes[node_index - 1], temp)
-        new_left.name = self._nodes[node_index - 1].name
-        self._nodes[node_index - 1] = new_left
+        new_left = self._xp.tensordot(
+            self._tensors[node_index - 1], u * s, axes=([2], [0])
+        )
+        self._set_site_tensor(node_index - 1, new_left)
 
     def apply_one_qudit_gate_to_all(self, gate: tn.Node) -> None:
         """Applies a single qudit gate to all tensors in the MPS.
 
         Args:
             gate: Single qudit gate to apply. A tensor with two free indices.
+
+        Notes:
+            A unitary gate is applied to all tensors with a single matrix
+            multiplication. Non-unitary gates are applied one tensor at a time
+            so that the MPS is orthonormalized and renormalized after each.
         """
-        for i in range(self._nqudits):
-            self.apply_one_qudit_gate(gate, i)
+        if not is_unitary(gate):
+            for i in range(self._nqudits):
+                self.apply_one_qudit_gate(gate, i)
+            return
+
+        if not self._skip_validation and not self.is_valid():
+            raise ValueError("MPS is invalid.")
+        self._check_one_qudit_gate(gate)
+
+        # Stack the tensors along their connected edges, apply the gate to the
+        # free edge of all tensors at once, then split the result back
+        d = self._qudit_dimension
+        shapes = [tensor.shape for tensor in self._tensors]
+        stacked = self._xp.concatenate(
+            [self._xp.reshape(tensor, (d, -1)) for tensor in self._tensors],
+            axis=1
+        )
+        new = self._xp.asarray(gate.tensor) @ stacked
+        offsets = np.cumsum([left * right for (_, left, right) in shapes])
+        offsets = offsets[:-1].tolist()
+        blocks = self._xp.split(new, offsets, axis=1)
+        self._tensors = [
+            self._xp.reshape(block, shape)
+            for block, shape in zip(blocks, shapes)
+        ]
+        self._node_cache = None
 
     def apply_two_qudit_gate(
         self, gate: tn.Node, node_index1: int, node_index2: int, **kwargs
@@ -974,6 +1352,19 @@ class MPS:
                 fraction of the maximum bond dimension.
                 Must be between 0 and 1, inclusive.
 
+            track_norms (bool): If True, the norm of the MPS after applying
+                the gate is appended to MPS.norms(). Default is False since
+                computing the norm requires contracting the entire MPS.
+
+            contract (str): How the gate is contracted with the tensors.
+                Either "einsum" (default) for one optimized einsum, or
+                "tensordot" for two explicit tensordot calls.
+
+            svd (str): Either "exact" (default) or "randomized" to compute
+                the singular values kept with maxsvals (or fraction) by a
+                randomized SVD when they are few compared to the size of the
+                matrix. The randomized SVD is faster but only approximate.
+
         Notes:
             The following gate edge convention is used to connect gate edges to
             MPS edges. Let `matrix` be a 4x4 (unitary) matrix. Then,
@@ -996,10 +1387,25 @@ class MPS:
                 * Invalid MPS.
                 * Invalid indices (equal or out of bounds).
                 * Invalid two-qudit gate.
+                * Invalid contract or svd keyword.
         """
-        if not self.is_valid():
+        if not self._skip_validation and not self.is_valid():
             raise ValueError("MPS is not valid.")
 
+        contract = kwargs.get("contract", "einsum")
+        if contract not in ("einsum", "tensordot"):
+            raise ValueError(
+                "Keyword contract should be 'einsum' or 'tensordot' but is "
+                f"{contract}."
+            )
+
+        svd = kwargs.get("svd", "exact")
+        if svd not in ("exact", "randomized"):
+            raise ValueError(
+                "Keyword svd should be 'exact' or 'randomized' but is "
+                f"{svd}."
+            )
+
         if (node_index1 not in range(self._nqudits)
                 or node_index2 not in range(self.nqudits)):
             raise ValueError(
@@ -1027,9 +1433,12 @@ class MPS:
                 f"but should have MPS qudit dimension = {self._qudit_dimension}"
             )
 
-        # Flip the "control"/"target" gate edges and tensor edges if needed
+        # Flip the "control"/"target" gate edges and tensor edges if needed.
+        # The gate edges are flipped in the contraction subscripts so that the
+        # gate tensor is never transposed.
+        gate_subscripts = "ijpq"
         if node_index2 < node_index1:
-            gate.reorder_edges([gate[1], gate[0], gate[3], gate[2]])
+            gate_subscripts = "jiqp"
             node_index1, node_index2 = node_index2, node_index1
 
         # Swap tensors until adjacent if necessary
@@ -1042,64 +1451,35 @@ class MPS:
             )
             node_index1 = node_index2 - 1
 
-        # Connect the MPS tensors to the gate edges
-        _ = tn.connect(
-            self.get_free_edge_of(node_index=node_index1, copy=False),
-            gate.get_edge(2)
-        )
-        _ = tn.connect(
-            self.get_free_edge_of(node_index=node_index2, copy=False),
-            gate.get_edge(3)
-        )
-
-        # Store the free edges of the gate
-        left_gate_edge = gate.get_edge(0)
-        right_gate_edge = gate.get_edge(1)
-
-        # Contract the tensors in the MPS
-        new_node = tn.contract_between(
-            self._nodes[node_index1], self._nodes[node_index2]
-        )
-
-        # Flatten the two edges from the MPS node to the gate node
-        node_gate_edge = tn.flatten_edges_between(new_node, gate)
-
-        # Contract the flattened edge to get a new single MPS node
-        new_node = tn.contract(node_gate_edge)
-
-        # Get the left and right connected edges (if any)
-        left_connected_edge = None
-        right_connected_edge = None
-        for connected_edge in new_node.get_all_nondangling():
-            if self._prefix in connected_edge.node1.name:
-                # Use the "node1" node by default
-                index = int(connected_edge.node1.name.split(self._prefix)[-1])
-            else:
-                # If "node1" is the new_mps_node, use "node2"
-                index = int(connected_edge.node2.name.split(self._prefix)[-1])
-
-            # Get the connected edges (if any)
-            if index <= node_index1:
-                left_connected_edge = connected_edge
-            else:
-                right_connected_edge = connected_edge
+        # Contract the gate with both MPS tensors in one step, grouping the
+        # left free and connected edges into the rows and the right free and
+        # connected edges into the columns of the matrix to split
+        left = self._tensors[node_index1]
+        right = self._tensors[node_index2]
+        d = self._qudit_dimension
+        left_bond = left.shape[1]
+        right_bond = right.shape[2]
+        if contract == "einsum":
+            new = self._contract(
+                gate_subscripts + ",plm,qmr->iljr",
+                self._xp.asarray(gate.tensor),
+                left,
+                right
+            )
+        else:
+            # Contract the tensors with axes (p, l, q, r), then the gate with
+            # axes (i, j, p, q) to get axes (i, j, l, r)
+            gate_tensor = self._xp.asarray(gate.tensor)
+            if gate_subscripts == "jiqp":
+                gate_tensor = self._xp.transpose(gate_tensor, (1, 0, 3, 2))
+            pair = self._xp.tensordot(left, right, axes=([2], [1]))
+            new = self._xp.tensordot(gate_tensor, pair, axes=([2, 3], [0, 2]))
+            new = self._xp.transpose(new, (0, 2, 1, 3))
 
         # ================================================
         # Do the SVD to split the single MPS node into two
         # ================================================
-        # Get the left and right free edges from the original gate
-        left_free_edge = left_gate_edge
-        right_free_edge = right_gate_edge
-
-        # Group the left (un)connected and right (un)connected edges
-        left_edges = [
-            edge for edge in (left_free_edge, left_connected_edge)
-            if edge is not None
-        ]
-        right_edges = [
-            edge for edge in (right_free_edge, right_connected_edge)
-            if edge is not None
-        ]
+        matrix = self._xp.reshape(new, (d * left_bond, d * right_bond))
 
         # Options for canonicalization + truncation
         if "keep_left_canonical" in kwargs.keys():
@@ -1129,27 +1509,29 @@ class MPS:
         if "maxsvals" in kwargs.keys():
             maxsvals = int(kwargs.get("maxsvals"))
 
-        u, s, vdag, truncated_svals = tn.split_node_full_svd(
-            new_node,
-            left_edges=left_edges,
-            right_edges=right_edges,
+        u, s, vdag, _ = _svd(
+            matrix,
             max_singular_values=maxsvals,
+            randomized=svd == "randomized",
         )
 
         # Contract the tensors to keep left or right canonical form
         if keep_left_canonical:
-            new_left = u
-            new_right = tn.contract_between(s, vdag)
+            vdag = self._xp.reshape(s, (s.size, 1)) * vdag
         else:
-            new_left = tn.contract_between(u, s)
-            new_right = vdag
-
-        # Put the new tensors after applying the gate back into the MPS list
-        new_left.name = self._nodes[node_index1].name
-        new_right.name = self._nodes[node_index2].name
+            u = u * s
 
-        self._nodes[node_index1] = new_left
-        self._nodes[node_index2] = new_right
+        # Put the new tensors after applying the gate back into the MPS. The
+        # transposed right tensor is stored contiguously so that it is copied
+        # once here rather than in every later contraction.
+        self._set_site_tensor(
+            node_index1, self._xp.reshape(u, (d, left_bond, s.size))
+        )
+        vdag = self._xp.reshape(vdag, (s.size, d, right_bond))
+        self._set_site_tensor(
+            node_index2,
+            self._xp.ascontiguousarray(self._xp.transpose(vdag, (1, 0, 2)))
+        )
 
         # Invert the Swap network, if necessary
         if invert_swap_network:
@@ -1157,8 +1539,9 @@ class MPS:
                 node_index1, original_index1, **kwargs
             )
 
-        # TODO: Remove. This is only for convenience in benchmarking.
-        self._norms.append(self.norm())
+        # Optionally store the norm, e.g. to track truncation in benchmarks
+        if kwargs.get("track_norms"):
+            self._norms.append(self.norm())
 
     def move_node_from_left_to_right(
             self, current_node_index: int, final_node_index: int, **kwargs
@@ -1242,9 +1625,51 @@ class MPS:
         except TypeError:
             operations = (operations,)
 
+        # Each gate leaves a valid MPS, so the MPS is only checked once here
+        # instead of before every gate
+        if not self._skip_validation and not self.is_valid():
+            raise ValueError("MPS is invalid.")
+
         # TODO: Parallelize application of operations
-        for op in operations:
-            self._apply_mps_operation(op, **kwargs)
+        with self.no_validation():
+            for op in operations:
+                self._apply_mps_operation(op, **kwargs)
+
+    def apply_schedule(
+        self,
+        schedule: Iterable[Tuple[int, int, int, tn.Node]],
+        **kwargs,
+    ) -> None:
+        """Applies a schedule of gates to the MPS.
+
+        This is a lighter alternative to MPS.apply for many gates, which
+        unpacks tuples instead of checking and unpacking MPS Operations.
+
+        Args:
+            schedule: Tuples (num_qudits, index1, index2, gate) to apply in
+                order, where num_qudits is one or two. For single qudit gates,
+                index1 and index2 are both the index of the qudit.
+                See MPSOperation.schedule_entry.
+
+        Keyword Args:
+            See apply_one_qudit_gate and apply_two_qudit_gate.
+
+        Raises:
+            ValueError: On an invalid MPS or gate.
+        """
+        if not self._skip_validation and not self.is_valid():
+            raise ValueError("MPS is invalid.")
+
+        with self.no_validation():
+            for num_qudits, index1, index2, gate in schedule:
+                if num_qudits == 1:
+                    self.apply_one_qudit_gate(gate, index1, **kwargs)
+                elif num_qudits == 2:
+                    self.apply_two_qudit_gate(gate, index1, index2, **kwargs)
+                else:
+                    raise ValueError(
+                        "Only one-qudit and two-qudit gates are supported."
+                    )
 
     def _apply_mps_operation(self, operation: MPSOperation, **kwargs) -> None:
         """Applies the MPS Operation to the MPS.
@@ -1260,13 +1685,14 @@ class MPS:
         if not operation.is_valid():
             raise ValueError("Input MPS Operation is not valid.")
 
+        # The gate is not copied since applying it only reads its tensor
         if operation.is_single_qudit_operation():
             self.apply_one_qudit_gate(
-                operation.node(), *operation.qudit_indices, **kwargs
+                operation.node(copy=False), *operation.qudit_indices, **kwargs
             )
         elif operation.is_two_qudit_operation():
             self.apply_two_qudit_gate(
-                operation.node(), *operation.qudit_indices, **kwargs
+                operation.node(copy=False), *operation.qudit_indices, **kwargs
             )
         else:
             raise ValueError(
@@ -1359,32 +1785,96 @@ class MPS:
         for i in range(self._nqudits - 2, 0, -2):
             self.haar_random(i - 1, i, keep_left_canonical=False, **kwargs)
 
-    def sweep_cnots_left_to_right(self, **kwargs) -> None:
+    def _apply_two_qudit_gate_layer(
+        self,
+        gate: tn.Node,
+        pairs: Sequence[Tuple[int, int]],
+        nthreads: int = 1,
+        **kwargs
+    ) -> None:
+        """Applies the gate to each pair of adjacent nodes.
+
+        The pairs must not share any node, so the gates commute and can be
+        applied in any order. The MPS is validated once before the layer.
+
+        Args:
+            gate: Two qudit gate to apply. All applications share this gate.
+            pairs: Pairs of indices of adjacent nodes to apply the gate to.
+            nthreads: Number of threads to apply the gates with. Each gate only
+                modifies its own pair of tensors, and NumPy releases the GIL
+                in the contractions and SVDs, so gates run concurrently.
+
+        Keyword Arguments:
+            See MPS.apply_two_qudit_gate. If nthreads > 1 and track_norms=True,
+            the norm is stored once after the whole layer.
+        """
+        if not self._skip_validation and not self.is_valid():
+            raise ValueError("MPS is not valid.")
+
+        with self.no_validation():
+            if nthreads <= 1:
+                for (a, b) in pairs:
+                    self.apply_two_qudit_gate(gate, a, b, **kwargs)
+                return
+
+            track_norms = kwargs.pop("track_norms", False)
+            with ThreadPoolExecutor(max_workers=nthreads) as executor:
+                futures = [
+                    executor.submit(
+                        self.apply_two_qudit_gate, gate, a, b, **kwargs
+                    )
+                    for (a, b) in pairs
+                ]
+                for future in futures:
+                    future.result()
+            if track_norms:
+                self._norms.append(self.norm())
+
+    def sweep_cnots_left_to_right(self, nthreads: int = 1, **kwargs) -> None:
         """Applies a layer of CNOTs between adjacent qubits
         going from left to right.
+
+        Args:
+            nthreads: Number of threads to apply the (commuting) CNOTs with.
         """
-        for i in range(0, self._nqudits - 1, 2):
-            self.cnot(i, i + 1, keep_left_canonical=True, **kwargs)
+        self._apply_two_qudit_gate_layer(
+            cnot(),
+            [(i, i + 1) for i in range(0, self._nqudits - 1, 2)],
+            nthreads,
+            keep_left_canonical=True,
+            **kwargs
+        )
 
-    def sweep_cnots_right_to_left(self, **kwargs) -> None:
+    def sweep_cnots_right_to_left(self, nthreads: int = 1, **kwargs) -> None:
         """Applies a layer of CNOTs between adjacent qubits
-         going from right to left.
-         """
-        for i in range(self._nqudits - 2, 0, -2):
-            self.cnot(i - 1, i, keep_left_canonical=False, **kwargs)
+        going from right to left.
+
+        Args:
+            nthreads: Number of threads to apply the (commuting) CNOTs with.
+        """
+        self._apply_two_qudit_gate_layer(
+            cnot(),
+            [(i - 1, i) for i in range(self._nqudits - 2, 0, -2)],
+            nthreads,
+            keep_left_canonical=False,
+            **kwargs
+        )
 
     def swap(self, a: int, b: int, **kwargs) -> None:
         """Applies a SWAP gate between qubits indexed `a` and `b`."""
         if b < a:
             a, b = b, a
-        self.apply_two_qudit_gate(swap(), a, b, **kwargs)
+        # The SWAP gate is exact in any precision, so it does not promote the
+        # tensors of an MPS with a given data type
+        gate = swap() if self._dtype is None else swap(self._dtype)
+        self.apply_two_qudit_gate(gate, a, b, **kwargs)
 
     def copy(self) -> 'MPS':
         """Returns a copy of the MPS."""
         return self.__copy__()
 
     def __str__(self):
-        return "----".join(str(tensor) for tensor in self._nodes)
+        return "----".join(self._names)
 
     def __eq__(self, other: 'MPS'):
         if not isinstance(other, MPS):
@@ -1403,21 +1893,34 @@ class MPS:
                 other._nqudits != self._nqudits):
             return False
         for i in range(self._nqudits):
+            if self._tensors[i].shape != other._tensors[i].shape:
+                return False
             if not np.allclose(
-                    self.get_node(i).tensor, other.get_node(i).tensor
+                _to_numpy(self._tensors[i]), _to_numpy(other._tensors[i])
             ):
                 return False
-            if i > 0:
-                if (self.get_left_connected_edge_of(i).dimension !=
-                        other.get_left_connected_edge_of(i).dimension):
-                    return False
-            if i < self._nqudits - 1:
-                if (self.get_right_connected_edge_of(i).dimension !=
-                        other.get_right_connected_edge_of(i).dimension):
-                    return False
         return True
 
+    def __getstate__(self):
+        # The array module and the cached network of nodes can't be pickled
+        state = self.__dict__.copy()
+        del state["_xp"]
+        state["_node_cache"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._xp = _array_module(self._backend)
+
     def __copy__(self):
-        new = MPS(self._nqudits, self._qudit_dimension, self._prefix)
-        new._nodes = self.get_nodes(copy=True)
+        new = MPS(
+            self._nqudits,
+            self._qudit_dimension,
+            self._prefix,
+            self._backend,
+            dtype=self._dtype,
+        )
+        # The copy shares the (immutable) tensors of this MPS
+        new._tensors = list(self._tensors)
+        new._norms = list(self._norms)
         return new
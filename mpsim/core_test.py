@@ -7,6 +7,9 @@ import numpy as np
 import tensornetwork as tn
 
 from mpsim import MPS, MPSOperation
+from mpsim.core import (
+    _apply_one_qudit, _contract_expression, _norm_step, _svd
+)
 from mpsim.gates import (
     igate,
     xgate,
@@ -14,6 +17,7 @@ from mpsim.gates import (
     hgate,
     cnot,
     cphase,
+    haar_random_unitary,
     zero_state,
     one_state,
     plus_state,
@@ -68,6 +72,16 @@ def test_two_qubit_mps_operation_nonlocal_cnot():
     assert mps_operation.is_two_qudit_operation()
 
 
+def test_mps_operation_has_no_instance_dictionary():
+    """Tests MPS Operations only store their slots."""
+    mps_operation = MPSOperation(cnot(), qudit_indices=(0, 2))
+    assert not hasattr(mps_operation, "__dict__")
+    with pytest.raises(AttributeError):
+        mps_operation.name = "cnot"
+    assert mps_operation.qudit_indices == (0, 2)
+    assert mps_operation.qudit_dimension == 2
+
+
 def test_mps_one_qudit():
     """Ensures an error is raised if the number of qudits is less than two."""
     for d in (2, 3, 10, 20, 100):
@@ -131,6 +145,14 @@ def test_max_bond_dimensions_even_nqudits():
     assert mps.wavefunction().shape == (d**6,)
 
 
+def test_max_bond_dimensions_many_qubits():
+    """Tests the maximum bond dimensions do not overflow for many qubits."""
+    mps = MPS(nqudits=100)
+    assert len(mps.max_bond_dimensions()) == 99
+    assert mps.max_bond_dimension_of(49) == 2 ** 50
+    assert mps.max_bond_dimension_of(98) == 2
+
+
 def test_get_max_bond_dimension_qubits():
     """Tests correctness for getting maximum bond dimensions in a qubit MPS."""
     mps = MPS(nqudits=10)
@@ -173,6 +195,18 @@ def test_get_free_edge_of():
                 assert free_edge.node1.name == f"q{i}"
 
 
+def test_get_copied_node_and_free_edge():
+    """Tests copies of nodes and free edges match the nodes of the MPS."""
+    mps = MPS(nqudits=4, qudit_dimension=3)
+    mps.apply_two_qudit_gate(haar_random_unitary(qudit_dimension=3), 1, 2)
+    for i in (0, 1, 2, 3, -1):
+        node = mps.get_node(i, copy=True)
+        assert node is not mps.get_node(i, copy=False)
+        assert node.name == mps.get_node(i, copy=False).name
+        assert np.array_equal(node.tensor, mps.get_node(i, copy=False).tensor)
+        assert mps.get_free_edge_of(i, copy=True).dimension == 3
+
+
 def test_get_left_connected_edge():
     """Tests getting the left connected edge of nodes in an MPS."""
     for d in (2, 3, 4):
@@ -343,6 +377,54 @@ def test_get_wavefunction_deosnt_modify_mps_qudits():
     assert len(right_node.get_all_dangling()) == 1
 
 
+def test_get_wavefunction_reuses_contraction_path():
+    """Tests the contraction path for the wavefunction is computed once and
+    reused on subsequent calls, including by copies of the MPS.
+    """
+    mps = MPS(nqudits=4)
+    mps.h(-1)
+    mps.cnot(0, 1)
+    first = mps.wavefunction()
+    misses = _contract_expression.cache_info().misses
+    second = mps.wavefunction()
+    third = mps.copy().wavefunction()
+    assert _contract_expression.cache_info().misses == misses
+    assert np.allclose(first, second)
+    assert np.allclose(first, third)
+
+
+def test_initial_tensors_are_shared_and_read_only():
+    """Tests the tensors of a new MPS share one read-only array which is not
+    affected by gates.
+    """
+    mps = MPS(nqudits=4)
+    ground_state = mps._tensors[0]
+    assert all(tensor is ground_state for tensor in mps._tensors)
+    assert not ground_state.flags.writeable
+
+    mps.x(1)
+    mps.cnot(1, 2)
+    assert np.array_equal(ground_state.flatten(), [1., 0.])
+    assert mps._tensors[0] is ground_state
+    assert mps._tensors[1] is not ground_state
+
+
+@pytest.mark.parametrize("qudit_dimension", [2, 3])
+def test_initial_computational_basis_state(qudit_dimension):
+    """Tests an MPS initialized in each computational basis state."""
+    nqudits = 3
+    for state in range(qudit_dimension ** nqudits):
+        mps = MPS(nqudits, qudit_dimension=qudit_dimension, state=state)
+        assert mps.is_valid()
+        correct = np.zeros(qudit_dimension ** nqudits)
+        correct[state] = 1.
+        assert np.allclose(mps.wavefunction(), correct)
+
+    for state in (-1, qudit_dimension ** nqudits):
+        with pytest.raises(ValueError):
+            MPS(nqudits, qudit_dimension=qudit_dimension, state=state)
+
+
 def test_correctness_of_initial_product_state_two_qubits():
     """Tests that the contracted MPS is indeed the all zero state
     for two qubits.
@@ -406,6 +488,46 @@ def test_apply_oneq_gate_to_all_hadamard():
     assert np.allclose(mps.wavefunction(), correct)
 
 
+def test_apply_oneq_gate_to_all_entangled_state():
+    """Tests applying a gate to all qudits of an MPS with different bond
+    dimensions agrees with applying the gate to each qudit in turn.
+    """
+    n = 5
+    wavefunction = np.random.RandomState(1).randn(2 ** n)
+    wavefunction /= np.linalg.norm(wavefunction)
+    mps = MPS.from_wavefunction(wavefunction, nqudits=n)
+    correct = mps.copy()
+    gate = haar_random_unitary(nqudits=1, seed=2)
+
+    mps.apply_one_qudit_gate_to_all(gate)
+    for i in range(n):
+        correct.apply_one_qudit_gate(gate, i)
+    assert mps.bond_dimensions() == [2, 4, 4, 2]
+    assert np.allclose(mps.wavefunction(), correct.wavefunction())
+
+
+@pytest.mark.parametrize("d", [2, 3])
+def test_apply_one_qudit_gate_random_states(d: int):
+    """Tests single qudit gates on random MPS against the wavefunction."""
+    n = 4
+    np.random.seed(7)
+    wavefunction = np.random.randn(d**n) + np.random.randn(d**n) * 1j
+    wavefunction /= np.linalg.norm(wavefunction)
+    for j in range(n):
+        mps = MPS.from_wavefunction(wavefunction, nqudits=n, qudit_dimension=d)
+        gate = haar_random_unitary(nqudits=1, qudit_dimension=d, seed=j)
+        mps.apply_one_qudit_gate(gate, j)
+
+        correct = np.moveaxis(
+            np.tensordot(
+                gate.tensor, np.reshape(wavefunction, [d] * n), axes=([1], [j])
+            ),
+            0, j
+        )
+        assert np.allclose(mps.wavefunction(), correct.flatten(), atol=1e-6)
+        assert mps.is_valid()
+
+
 def test_apply_twoq_cnot_two_qubits():
     """Tests for correctness of final wavefunction after applying a CNOT
     to a two-qubit MPS.
@@ -472,6 +594,104 @@ def test_apply_twoq_cnot_two_qubits_flipped_control_and_target():
     assert np.allclose(mps.wavefunction(), correct)
 
 
+@pytest.mark.parametrize("contract", ["einsum", "tensordot"])
+@pytest.mark.parametrize(["indices"], [[(1, 2)], [(2, 1)], [(0, 3)], [(3, 0)]])
+def test_apply_twoq_random_gate_matches_dense_unitary(indices, contract):
+    """Tests applying a random two-qubit gate to an entangled MPS agrees with
+    applying the gate to the wavefunction.
+    """
+    mps = MPS(nqudits=4)
+    mps.h(0)
+    mps.cnot(0, 1)
+    mps.cnot(1, 2)
+    before = mps.wavefunction()
+
+    gate = haar_random_unitary(seed=1)
+    matrix = np.reshape(gate.tensor, newshape=(4, 4))
+    mps.apply_two_qudit_gate(gate, *indices, contract=contract)
+
+    # Order the qubits as (control, target, rest) to apply the dense unitary
+    i, j = indices
+    axes = [i, j] + [k for k in range(4) if k not in indices]
+    state = np.transpose(np.reshape(before, newshape=[2] * 4), axes)
+    state = np.reshape(matrix @ np.reshape(state, newshape=(4, 4)), [2] * 4)
+    correct = np.transpose(state, np.argsort(axes)).flatten()
+    assert np.allclose(mps.wavefunction(), correct, atol=1e-6)
+
+
+def test_apply_twoq_invalid_contract_raises_error():
+    """Tests an unsupported contract keyword raises an error."""
+    mps = MPS(nqudits=2)
+    with pytest.raises(ValueError):
+        mps.cnot(0, 1, contract="matmul")
+
+
+def test_no_validation_skips_validity_checks():
+    """Tests gates skip the validity check of the MPS only inside the
+    no_validation context.
+    """
+    mps = MPS(nqudits=3)
+    mps._tensors[1] = np.zeros((2, 2, 1), dtype=np.complex64)
+    with pytest.raises(ValueError):
+        mps.x(0)
+
+    mps = MPS(nqudits=3)
+    with mps.no_validation():
+        mps.h(0)
+        mps.cnot(0, 2)
+        assert mps._skip_validation
+    assert not mps._skip_validation
+    correct = np.zeros(2 ** 3)
+    correct[[0, -3]] = 1 / np.sqrt(2)
+    assert np.allclose(mps.wavefunction(), correct)
+
+
+def test_apply_operations_checks_mps_once():
+    """Tests MPS.apply raises an error for an invalid MPS, and otherwise
+    applies operations without copying or connecting their gates.
+    """
+    operations = [
+        MPSOperation(hgate(), 0),
+        MPSOperation(cnot(), (0, 2)),
+    ]
+
+    mps = MPS(nqudits=3)
+    mps._tensors[1] = np.zeros((2, 2, 1), dtype=np.complex64)
+    with pytest.raises(ValueError):
+        mps.apply(operations)
+
+    mps = MPS(nqudits=3)
+    mps.apply(operations)
+    assert not mps._skip_validation
+    assert all(operation.is_valid() for operation in operations)
+    correct = np.zeros(2 ** 3)
+    correct[[0, -3]] = 1 / np.sqrt(2)
+    assert np.allclose(mps.wavefunction(), correct)
+
+
+def test_apply_schedule_matches_apply():
+    """Tests applying the schedule of MPS Operations gives the same MPS as
+    applying the MPS Operations.
+    """
+    operations = [
+        MPSOperation(hgate(), 0),
+        MPSOperation(haar_random_unitary(seed=1), (2, 0)),
+        MPSOperation(xgate(), 1),
+        MPSOperation(cnot(), (1, 2)),
+    ]
+    mps = MPS(nqudits=3)
+    mps.apply(operations)
+    scheduled = MPS(nqudits=3)
+    scheduled.apply_schedule(
+        operation.schedule_entry() for operation in operations
+    )
+    assert not scheduled._skip_validation
+    assert scheduled == mps
+
+    with pytest.raises(ValueError):
+        scheduled.apply_schedule([(3, 0, 2, igate())])
+
+
 def test_apply_twoq_identical_indices_raises_error():
     """Tests that a two-qubit gate application with
     identical indices raises an error.
@@ -1062,6 +1282,18 @@ def test_norm_nqubit_product_state(n):
     assert MPS(nqudits=n).norm() == 1
 
 
+def test_norm_of_invalid_mps_raises_error():
+    """Tests the norm checks the MPS is valid unless validation is skipped."""
+    mps = MPS(nqudits=3)
+    mps._tensors[1] = np.zeros((2, 2, 1), dtype=np.complex64)
+    with pytest.raises(ValueError):
+        mps.norm()
+
+    mps = MPS(nqudits=3)
+    with mps.no_validation():
+        assert np.isclose(mps.norm(), 1.0)
+
+
 def test_norm_after_local_rotations():
     """Applies local rotations (single qubit gates) to an MPS and ensures
     the norm stays one.
@@ -1101,6 +1333,32 @@ def test_norm_is_zero_after_throwing_away_all_singular_values():
     assert mps.norm() == 0
 
 
+@pytest.mark.parametrize("n", [2, 3, 6])
+def test_norm_of_unnormalized_wavefunctions(n: int):
+    """Tests the norm of an MPS created from a random, unnormalized
+    wavefunction.
+    """
+    np.random.seed(2)
+    for d in (2, 3):
+        wavefunction = np.random.randn(d**n) + np.random.randn(d**n) * 1j
+        mps = MPS.from_wavefunction(wavefunction, nqudits=n, qudit_dimension=d)
+        assert np.isclose(mps.norm(), np.linalg.norm(wavefunction))
+
+
+def test_norms_are_only_tracked_when_requested():
+    """Tests norms after two-qubit gates are stored only with track_norms."""
+    mps = MPS(nqudits=3)
+    mps.h(0)
+    mps.cnot(0, 1)
+    assert mps.norms() == []
+
+    mps.cnot(1, 2, track_norms=True)
+    mps.cnot(0, 1, maxsvals=1, track_norms=True)
+    assert len(mps.norms()) == 2
+    assert np.isclose(mps.norms()[0], 1.)
+    assert np.isclose(mps.norms()[1], 1. / np.sqrt(2))
+
+
 def test_renormalize_mps_which_are_normalized():
     """Makes sure renormalizing a normalized MPS does nothing."""
     for n in range(2, 8):
@@ -1468,6 +1726,97 @@ def test_renormalize_after_non_unitary():
             assert np.isclose(mps.norm(), 1.)
 
 
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+def test_svd_matches_numpy(dtype):
+    """Tests the (truncated) SVD used for two-qudit gates against numpy."""
+    np.random.seed(4)
+    for shape in ((4, 4), (2, 8), (12, 6)):
+        matrix = (np.random.randn(*shape) + 1j * np.random.randn(*shape))
+        matrix = matrix.astype(dtype)
+        correct = np.linalg.svd(matrix, compute_uv=False)
+        for keep in (None, 0, 1, 2, 100):
+            u, s, vdag, truncated = _svd(matrix, max_singular_values=keep)
+            assert np.allclose(np.concatenate([s, truncated]), correct,
+                               atol=1e-5)
+            if keep is None or keep >= min(shape):
+                assert np.allclose(u * s @ vdag, matrix, atol=1e-5)
+            else:
+                assert u.shape == (shape[0], keep)
+                assert vdag.shape == (keep, shape[1])
+
+
+def test_randomized_svd_for_few_singular_values():
+    """Tests the randomized SVD for few singular values of a large matrix
+    against numpy.
+    """
+    rng = np.random.RandomState(3)
+    m, keep = 128, 8
+    left, _ = np.linalg.qr(rng.randn(m, m) + 1j * rng.randn(m, m))
+    right, _ = np.linalg.qr(rng.randn(m, m) + 1j * rng.randn(m, m))
+    svals = np.exp(-np.arange(m) / 4)
+    matrix = (left * svals) @ right
+
+    u, s, vdag, truncated = _svd(
+        matrix, max_singular_values=keep, randomized=True
+    )
+    assert u.shape == (m, keep)
+    assert vdag.shape == (keep, m)
+    assert np.allclose(s, svals[:keep])
+    assert np.allclose(u.conj().T @ u, np.identity(keep))
+    assert np.allclose(truncated, [np.linalg.norm(svals[keep:])])
+    assert np.isclose(
+        np.linalg.norm(matrix - u * s @ vdag), np.linalg.norm(svals[keep:])
+    )
+
+
+def test_svd_is_exact_by_default():
+    """Tests few singular values of a large matrix are computed exactly
+    unless the randomized SVD is asked for.
+    """
+    rng = np.random.RandomState(4)
+    m, keep = 128, 8
+    matrix = rng.randn(m, m) + 1j * rng.randn(m, m)
+    svals = np.linalg.svd(matrix, compute_uv=False)
+
+    _, s, _, truncated = _svd(matrix, max_singular_values=keep)
+    assert np.allclose(s, svals[:keep])
+    assert np.allclose(truncated, svals[keep:])
+
+
+def test_apply_two_qudit_gate_randomized_svd():
+    """Tests two qudit gates with the randomized SVD keyword, and that other
+    values of the keyword raise an error.
+    """
+    mps = MPS(nqudits=2)
+    mps.h(0)
+    mps.cnot(0, 1, svd="randomized")
+    assert np.allclose(
+        mps.wavefunction(), np.array([1, 0, 0, 1]) / np.sqrt(2)
+    )
+
+    with pytest.raises(ValueError):
+        mps.cnot(0, 1, svd="lanczos")
+
+
+def test_tensor_kernels_match_einsum():
+    """Tests the per-tensor kernels used by gates and the norm against
+    einsum.
+    """
+    rng = np.random.RandomState(5)
+    for shape in ((2, 1, 4), (3, 4, 4), (2, 8, 1)):
+        tensor = rng.randn(*shape) + 1j * rng.randn(*shape)
+        gate = rng.randn(shape[0], shape[0]) + 1j * rng.randn(*[shape[0]] * 2)
+        env = rng.randn(shape[1], shape[1]) + 1j * rng.randn(*[shape[1]] * 2)
+        assert np.allclose(
+            _apply_one_qudit(gate, tensor),
+            np.einsum("ij,jlr->ilr", gate, tensor)
+        )
+        assert np.allclose(
+            _norm_step(env, tensor),
+            np.einsum("ab,pac,pbd->cd", env, tensor, tensor.conj())
+        )
+
+
 @pytest.mark.parametrize("chi", [16, 32, 64, 128])
 def test_max_bond_dimension_not_surpassed(chi: int):
     """Applies operations with a max chi value and ensures the bond dimensions
@@ -1542,6 +1891,24 @@ def test_copy_method():
             assert mps_copy == mps
 
 
+def test_copy_shares_tensors_and_keeps_norms():
+    """Tests a copied MPS shares the tensors of the MPS and keeps its norms,
+    and that gates applied to either do not change the other.
+    """
+    mps = MPS(nqudits=3)
+    mps.h(0)
+    mps.cnot(0, 1, track_norms=True)
+    mps_copy = mps.copy()
+    assert all(a is b for a, b in zip(mps._tensors, mps_copy._tensors))
+    assert mps_copy.norms() == mps.norms()
+
+    wavefunction = mps.wavefunction()
+    mps_copy.cnot(1, 2, track_norms=True)
+    assert np.allclose(mps.wavefunction(), wavefunction)
+    assert len(mps.norms()) == 1
+    assert len(mps_copy.norms()) == 2
+
+
 def test_expectation_two_qubit_mps():
     """Tests some expectation values for a two-qubit MPS."""
     # |00>
@@ -1735,3 +2102,80 @@ def test_sample_uniform():
     freqs = np.array(list(hist.values())) / nsamples
     for freq in freqs:
         assert np.abs(freq - prob) < var
+
+
+def test_invalid_backend_raises_error():
+    """Tests an MPS with an unsupported backend raises an error."""
+    with pytest.raises(ValueError):
+        MPS(nqudits=2, backend="torch")
+
+
+def test_cupy_backend_matches_numpy_backend():
+    """Tests an MPS stored on a GPU gives the same results as on the CPU."""
+    pytest.importorskip("cupy")
+    n = 5
+    wavefunctions = []
+    for backend in ("numpy", "cupy"):
+        mps = MPS(nqudits=n, backend=backend)
+        mps.apply_one_qudit_gate_to_all(hgate())
+        for i in range(n - 1):
+            mps.apply_two_qudit_gate(haar_random_unitary(seed=i), i + 1, i)
+        mps.cnot(0, n - 1)
+        assert isinstance(mps.norm(), float)
+        wavefunctions.append(mps.wavefunction())
+    assert np.allclose(*wavefunctions, atol=1e-5)
+
+
+
+@pytest.mark.parametrize("contract", ["einsum", "tensordot"])
+def test_cupy_backend_on_mock_gpu(fake_cupy, contract: str):
+    """Tests gates on an MPS with the cupy backend stay on the device and give
+    the same results as on the CPU, using a mock GPU array module.
+    """
+    n = 5
+    wavefunction = np.random.RandomState(1).randn(2 ** n)
+    wavefunction /= np.linalg.norm(wavefunction)
+    mpss = []
+    for backend in ("numpy", "cupy"):
+        mps = MPS.from_wavefunction(wavefunction, nqudits=n, backend=backend)
+        mps.apply_one_qudit_gate_to_all(hgate())
+        for i in range(n - 1):
+            mps.apply_two_qudit_gate(
+                haar_random_unitary(seed=i), i + 1, i, contract=contract
+            )
+        mps.cnot(0, n - 1, contract=contract, maxsvals=2)
+        mps.sweep_cnots_left_to_right()
+        mps.apply_one_qudit_gate(computational_basis_projector(0), n - 1)
+        mps.apply_one_qudit_gate(computational_basis_projector(1), 2)
+        mps.dagger()
+        mpss.append(mps)
+
+    numpy_mps, cupy_mps = mpss
+    assert all(
+        isinstance(tensor, type(fake_cupy.ones(1)))
+        for tensor in cupy_mps._tensors
+    )
+    assert isinstance(cupy_mps.norm(), float)
+    assert np.isclose(cupy_mps.norm(), numpy_mps.norm())
+    assert np.allclose(cupy_mps.wavefunction(), numpy_mps.wavefunction())
+    assert cupy_mps == cupy_mps.copy()
+
+
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_sweep_cnots_with_threads(nthreads: int):
+    """Tests CNOT sweeps applied with threads agree with individual CNOTs."""
+    n = 7
+    mps = MPS(nqudits=n)
+    correct = MPS(nqudits=n)
+    for _ in range(3):
+        for i in range(n):
+            mps.r(i, seed=i + 1)
+            correct.r(i, seed=i + 1)
+        mps.sweep_cnots_left_to_right(nthreads=nthreads)
+        mps.sweep_cnots_right_to_left(nthreads=nthreads)
+        for i in range(0, n - 1, 2):
+            correct.cnot(i, i + 1)
+        for i in range(n - 2, 0, -2):
+            correct.cnot(i - 1, i)
+    assert mps.is_valid()
+    assert np.allclose(mps.wavefunction(), correct.wavefunction(), atol=1e-6)
@@ -1,10 +1,9 @@
 """Declarations of single qubit and two-qubit gates."""
 
-from copy import deepcopy
+from functools import lru_cache
 from typing import Optional, Union
 
 import numpy as np
-from scipy.linalg import expm
 from scipy.stats import unitary_group
 
 import tensornetwork as tn
@@ -110,32 +109,42 @@ _ymatrix = np.array([[0.0, -1j], [1j, 0.0]], dtype=np.complex64)
 _zmatrix = np.array([[1.0, 0.0], [0.0, -1.0]], dtype=np.complex64)
 
 
+def _freeze(*matrices: np.ndarray) -> None:
+    """Marks the given arrays as read-only so they can be shared by gates."""
+    for matrix in matrices:
+        matrix.setflags(write=False)
+
+
+_freeze(_hmatrix, _imatrix, _xmatrix, _ymatrix, _zmatrix)
+
+
 # Common single qubit gates as tn.Node objects
 # Note that functions are used because TensorNetwork connect/contract
-# functions modify Node objects
+# functions modify Node objects. The underlying (read-only) arrays are shared
+# since TensorNetwork never modifies a tensor in place.
 def igate() -> tn.Node:
     """Returns a single qubit identity gate."""
-    return tn.Node(deepcopy(_imatrix), name="igate")
+    return tn.Node(_imatrix, name="igate")
 
 
 def xgate() -> tn.Node:
     """Returns a Pauli X (NOT) gate."""
-    return tn.Node(deepcopy(_xmatrix), name="xgate")
+    return tn.Node(_xmatrix, name="xgate")
 
 
 def ygate() -> tn.Node:
     """Returns a Pauli Y gate."""
-    return tn.Node(deepcopy(_ymatrix), name="ygate")
+    return tn.Node(_ymatrix, name="ygate")
 
 
 def zgate() -> tn.Node:
     """Returns a Pauli Z gate."""
-    return tn.Node(deepcopy(_zmatrix), name="zmat")
+    return tn.Node(_zmatrix, name="zmat")
 
 
 def hgate() -> tn.Node:
     """Returns a Hadamard gate."""
-    return tn.Node(deepcopy(_hmatrix), name="hgate")
+    return tn.Node(_hmatrix, name="hgate")
 
 
 def rgate(seed: Optional[int] = None, angle_scale: float = 1.0):
@@ -157,14 +166,26 @@ def rgate(seed: Optional[int] = None, angle_scale: float = 1.0):
     
     theta *= angle_scale
 
-    # Get the unitary
-    unitary = expm(
-        -1j * theta * (mx * _xmatrix + my * _ymatrix * mz * _zmatrix)
-    )
+    # Get the unitary exp(-i theta m.sigma) in closed form, using that
+    # (m.sigma)^2 = I for the unit vector m
+    unitary = (
+        np.cos(theta) * _imatrix
+        - 1j * np.sin(theta) * (mx * _xmatrix + my * _ymatrix + mz * _zmatrix)
+    ).astype(np.complex64, copy=False)
     return tn.Node(unitary)
 
 
-# TODO: Simplify implementation using computational_basis_state
+@lru_cache(maxsize=None)
+def _projector_matrix(state: int, dim: int) -> np.ndarray:
+    """Returns the (read-only) matrix |state><state| for a qudit of dimension
+    dim, which is built once for each state and dimension.
+    """
+    basis_vector = np.eye(dim)[state]
+    matrix = np.outer(basis_vector, basis_vector)
+    _freeze(matrix)
+    return matrix
+
+
 def computational_basis_projector(state: int, dim: int = 2) -> tn.Node:
     """Returns a projector onto a computational basis state which acts on a
     single qudit of dimension dim.
@@ -186,19 +207,23 @@ def computational_basis_projector(state: int, dim: int = 2) -> tn.Node:
         raise ValueError(
             f"Requires state < dim but state = {state} and dim = {dim}."
         )
-    projector = np.zeros((dim, dim))
-    projector[state, state] = 1.
-    return tn.Node(projector, name=f"|{state}><{state}|")
+    return tn.Node(
+        _projector_matrix(state, dim), name=f"|{state}><{state}|"
+    )
 
 
 # Common two qubit gates as np.ndarray objects
+# Note: These are kept in double precision. Contracting them promotes the MPS
+# tensors to complex128, which is needed for accurate wavefunctions after
+# sequences of two-qubit gates.
 _cnot_matrix = np.array(
     [
         [1.0, 0.0, 0.0, 0.0],
         [0.0, 1.0, 0.0, 0.0],
         [0.0, 0.0, 0.0, 1.0],
         [0.0, 0.0, 1.0, 0.0],
-    ]
+    ],
+    dtype=np.complex128
 )
 _cnot_matrix = np.reshape(_cnot_matrix, newshape=(2, 2, 2, 2))
 _swap_matrix = np.array(
@@ -207,18 +232,38 @@ _swap_matrix = np.array(
         [0.0, 0.0, 1.0, 0.0],
         [0.0, 1.0, 0.0, 0.0],
         [0.0, 0.0, 0.0, 1.0],
-    ]
+    ],
+    dtype=np.complex128
 )
 _swap_matrix = np.reshape(_swap_matrix, newshape=(2, 2, 2, 2))
+_freeze(_cnot_matrix, _swap_matrix)
 
 
 # Common two qubit gates as tn.Node objects
 def cnot() -> tn.Node:
-    return tn.Node(deepcopy(_cnot_matrix), name="cnot")
+    return tn.Node(_cnot_matrix, name="cnot")
+
+
+@lru_cache(maxsize=None)
+def _swap_matrix_of(dtype: np.dtype) -> np.ndarray:
+    """Returns the (read-only) SWAP matrix with the given data type, which is
+    built once for each data type.
+    """
+    matrix = _swap_matrix.astype(dtype)
+    _freeze(matrix)
+    return matrix
 
 
-def swap() -> tn.Node:
-    return tn.Node(deepcopy(_swap_matrix), name="swap")
+def swap(dtype: np.dtype = np.complex128) -> tn.Node:
+    """Returns a SWAP gate.
+
+    Args:
+        dtype: Data type of the gate. Default is complex128. The gate is exact
+            in any precision.
+    """
+    if np.dtype(dtype) == _swap_matrix.dtype:
+        return tn.Node(_swap_matrix, name="swap")
+    return tn.Node(_swap_matrix_of(np.dtype(dtype)), name="swap")
 
 
 def cphase(exp: float) -> tn.Node:
@@ -240,9 +285,9 @@ def random_two_qubit_gate(seed: Optional[int] = None) -> tn.Node:
     """
     if seed:
         np.random.seed(seed)
-    unitary = unitary_group.rvs(dim=4)
+    unitary = unitary_group.rvs(dim=4).astype(np.complex64, copy=False)
     unitary = np.reshape(unitary, newshape=(2, 2, 2, 2))
-    return tn.Node(deepcopy(unitary), name="R2Q")
+    return tn.Node(unitary, name="R2Q")
 
 
 def haar_random_unitary(
@@ -2,6 +2,7 @@
 
 import numpy as np
 import pytest
+from scipy.linalg import expm
 
 from mpsim.gates import (
     computational_basis_projector,
@@ -12,8 +13,11 @@ from mpsim.gates import (
     xgate,
     ygate,
     zgate,
+    rgate,
     cnot,
     cphase,
+    swap,
+    random_two_qubit_gate,
     haar_random_unitary
 )
 
@@ -81,3 +85,61 @@ def test_haar_random_unitary():
         for d in [2, 3, 5]:
             gate = haar_random_unitary(nqudits=n, qudit_dimension=d, seed=1)
             assert is_unitary(gate)
+
+
+def test_gates_share_read_only_tensors():
+    """Tests gate factories return distinct nodes with shared read-only data."""
+    for factory in (igate, hgate, xgate, ygate, zgate, cnot):
+        first, second = factory(), factory()
+        assert first is not second
+        assert np.shares_memory(first.tensor, second.tensor)
+        with pytest.raises(ValueError):
+            first.tensor[0] = 0.
+
+
+def test_qudit_projectors_are_shared():
+    """Tests projectors on qudits are correct and built once per state."""
+    for state in range(3):
+        projector = computational_basis_projector(state=state, dim=3)
+        correct_tensor = np.zeros((3, 3))
+        correct_tensor[state, state] = 1.
+        assert np.array_equal(projector.tensor, correct_tensor)
+        assert projector.tensor is computational_basis_projector(
+            state=state, dim=3
+        ).tensor
+
+
+@pytest.mark.parametrize("angle_scale", [1.0, 0.1])
+def test_rgate_matches_matrix_exponential(angle_scale):
+    """Tests rgate is the rotation exp(-i theta m.sigma) for the random angle
+    theta and unit vector m drawn from the seed.
+    """
+    for seed in range(1, 10):
+        np.random.seed(seed)
+        theta, alpha, phi = np.random.rand(3) * 2 * np.pi
+        m = (
+            np.sin(alpha) * np.cos(phi) * xgate().tensor
+            + np.sin(alpha) * np.sin(phi) * ygate().tensor
+            + np.cos(alpha) * zgate().tensor
+        )
+        correct = expm(-1j * theta * angle_scale * m)
+
+        gate = rgate(seed=seed, angle_scale=angle_scale)
+        assert is_unitary(gate)
+        assert np.allclose(gate.tensor, correct, atol=1e-6)
+
+
+def test_random_gates_are_single_precision():
+    """Tests random gates match the complex64 dtype of single qubit gates."""
+    for gate in (rgate(seed=1), random_two_qubit_gate(seed=1), xgate()):
+        assert gate.tensor.dtype == np.complex64
+        assert is_unitary(gate)
+
+
+def test_swap_dtype():
+    """Tests SWAP gates with a given data type are exact and shared."""
+    for dtype in (np.complex64, np.complex128):
+        gate = swap(dtype)
+        assert gate.tensor.dtype == dtype
+        assert np.array_equal(gate.tensor, swap().tensor)
+        assert gate.tensor is swap(dtype).tensor
@@ -1,33 +1,81 @@
 """Defines mpsim circuits as extensions of Cirq circuits."""
 
-from typing import Dict, List
+from typing import (
+    Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+)
 
 import numpy as np
 
 import cirq
 import tensornetwork as tn
 from mpsim.core import MPSOperation, CannotConvertToMPSOperation
+from mpsim.gates import is_unitary
+
+
+def line_qubit_index_lookup(
+        ordered_qubits: Sequence[cirq.Qid]
+) -> Optional[List[int]]:
+    """Returns a list whose entry x is the MPS index of cirq.LineQubit(x), or
+    None if the qubits are not all line qubits with small non-negative x.
+
+    Looking up qubits by position in this list is faster than hashing them
+    into a dictionary.
+
+    Args:
+        ordered_qubits: Qubits ordered by their MPS indices.
+    """
+    if not all(isinstance(qubit, cirq.LineQubit) for qubit in ordered_qubits):
+        return None
+    positions = [qubit.x for qubit in ordered_qubits]
+    if min(positions, default=0) < 0:
+        return None
+    if max(positions, default=0) >= 2 * len(positions):
+        return None
+
+    lookup = [-1] * (max(positions, default=-1) + 1)
+    for index, x in enumerate(positions):
+        lookup[x] = index
+    return lookup
 
 
 def mps_operation_from_gate_operation(
         gate_operation: cirq.GateOperation,
-        qudit_to_index_map: Dict[cirq.Qid, int]
+        qudit_to_index_map: Union[Dict[cirq.Qid, int], Sequence[int]],
+        dtype: Optional[np.dtype] = None,
 ) -> MPSOperation:
     """Constructs an MPS Operation from a gate operation.
 
     Args:
         gate_operation: A valid cirq.GateOperation or any child class.
-        qudit_to_index_map: Dictionary to map qubits to MPS indices.
+        qudit_to_index_map: Dictionary to map qubits to MPS indices, or a
+            lookup returned by line_qubit_index_lookup.
+        dtype: Data type to cast the unitary of the operation to. By default
+            the unitary keeps the data type Cirq returns it in.
 
     Raises:
         CannotConvertToMPSOperation
             If the gate operation does not have a _unitary_ method.
+        ValueError
+            If a qubit of the gate operation is not in the lookup.
     """
     num_qudits = len(gate_operation.qubits)
     qudit_dimension = 2  # TODO: Check if all Cirq ops are qubit ops
-    qudit_indices = tuple(
-        [qudit_to_index_map[qudit] for qudit in gate_operation.qubits]
-    )
+    if isinstance(qudit_to_index_map, Sequence):
+        qudit_indices = tuple(
+            [qudit_to_index_map[qudit.x]
+             if isinstance(qudit, cirq.LineQubit)
+             and 0 <= qudit.x < len(qudit_to_index_map) else -1
+             for qudit in gate_operation.qubits]
+        )
+        if -1 in qudit_indices:
+            raise ValueError(
+                f"Operation {gate_operation} acts on qubits which are not in "
+                "the line qubit lookup."
+            )
+    else:
+        qudit_indices = tuple(
+            [qudit_to_index_map[qudit] for qudit in gate_operation.qubits]
+        )
 
     if not gate_operation._has_unitary_():
         raise CannotConvertToMPSOperation(
@@ -36,6 +84,8 @@ def mps_operation_from_gate_operation(
         )
 
     tensor = gate_operation._unitary_()
+    if dtype is not None:
+        tensor = tensor.astype(dtype, copy=False)
     tensor = np.reshape(
         tensor, newshape=[qudit_dimension] * 2 * num_qudits
     )
@@ -46,6 +96,174 @@ def mps_operation_from_gate_operation(
 MPSOperation.from_gate_operation = mps_operation_from_gate_operation
 
 
+def fuse_operations(
+        operations: Iterable[MPSOperation]
+) -> Iterator[MPSOperation]:
+    """Yields an equivalent sequence of MPS Operations with fewer operations.
+
+    Consecutive single qudit operations on the same qudit are multiplied into
+    one operation, which is then absorbed into the next two qudit operation
+    acting on that qudit. Single qudit operations which are not followed by a
+    two qudit operation are appended at the end. This is valid since they
+    commute with all later operations, which act on other qudits.
+
+    Only unitary single qudit operations are fused. Non-unitary ones (e.g.,
+    projectors) are kept in place, since MPS.apply_one_qudit_gate
+    orthonormalizes and renormalizes the MPS after them.
+
+    The fused operations give the same MPS only if no singular values are
+    truncated. Otherwise a single qudit operation can be moved past the SWAP
+    gates of a nonlocal two qudit operation which truncate degenerate (e.g.,
+    zero) singular values of its tensor, so that different singular vectors
+    are kept.
+
+    Operations are consumed lazily, so a generator of operations is never
+    materialized as a list.
+
+    Args:
+        operations: MPS Operations to fuse, in the order they are applied.
+    """
+    # Single qudit matrix (and the operation, if unchanged) waiting on a qudit
+    pending: Dict[int, Tuple[np.ndarray, Optional[MPSOperation]]] = {}
+
+    def flush(index: int) -> MPSOperation:
+        matrix, operation = pending.pop(index)
+        if operation is None:
+            operation = MPSOperation(
+                tn.Node(matrix), index, qudit_dimension=matrix.shape[0]
+            )
+        return operation
+
+    for operation in operations:
+        if (operation.is_single_qudit_operation()
+                and is_unitary(operation.node(copy=False))):
+            index, = operation.qudit_indices
+            if index in pending:
+                matrix = operation.tensor() @ pending[index][0]
+                pending[index] = (matrix, None)
+            else:
+                pending[index] = (operation.tensor(), operation)
+
+        elif (operation.is_two_qudit_operation()
+              and any(index in pending for index in operation.qudit_indices)):
+            d = operation.qudit_dimension
+            left, right = [
+                pending.pop(index)[0] if index in pending
+                else np.identity(d, dtype=operation.node(copy=False).dtype)
+                for index in operation.qudit_indices
+            ]
+            matrix = operation.tensor() @ np.kron(left, right)
+            yield MPSOperation(
+                tn.Node(np.reshape(matrix, newshape=[d] * 4)),
+                operation.qudit_indices,
+                qudit_dimension=d,
+            )
+
+        else:
+            for index in operation.qudit_indices:
+                if index in pending:
+                    yield flush(index)
+            yield operation
+
+    for index in list(pending):
+        yield flush(index)
+
+
+def fuse_local_blocks(
+        operations: Iterable[MPSOperation],
+        absorb_single_qudit: bool = True,
+) -> Iterator[MPSOperation]:
+    """Yields an equivalent sequence of MPS Operations in which consecutive
+    two qudit operations on the same pair of qudits, and single qudit
+    operations on these qudits, are multiplied into one two qudit operation.
+    The MPS then does one SVD for the block instead of one for each of its
+    two qudit operations.
+
+    An operation acting on qudits i < j also acts on all qudits between them,
+    since the MPS applies it with a chain of (truncating) SWAP gates. A block
+    therefore ends when any operation acts on a qudit between (or at) the
+    indices of the block without merging into it. Blocks are yielded in the
+    order they are started, and only operations acting on no qudit between
+    the indices of a pending block are yielded before it, so operations are
+    never reordered past the SWAP gates of a block. With truncation, each
+    block is still truncated once, and single qudit operations multiplied
+    into a block can change which singular vectors are kept, as explained in
+    fuse_operations.
+
+    Operations are consumed lazily, as in fuse_operations.
+
+    Args:
+        operations: MPS Operations to fuse, in the order they are applied.
+        absorb_single_qudit: If False, single qudit operations are not
+            multiplied into blocks but end the blocks acting on their qudit.
+            Non-unitary single qudit operations are never multiplied into
+            blocks, as in fuse_operations.
+    """
+    # Blocks [matrix, indices, operation (if unchanged)] in the order they
+    # were started. Pending blocks act on disjoint ranges of qudits.
+    pending: List[List] = []
+
+    def flush(block: List) -> MPSOperation:
+        matrix, indices, operation = block
+        if operation is None:
+            d = int(np.sqrt(matrix.shape[0]))
+            operation = MPSOperation(
+                tn.Node(np.reshape(matrix, newshape=[d] * 4)),
+                indices,
+                qudit_dimension=d,
+            )
+        return operation
+
+    for operation in operations:
+        indices = operation.qudit_indices
+        low, high = min(indices), max(indices)
+        overlapping = [
+            position for position, block in enumerate(pending)
+            if min(block[1]) <= high and low <= max(block[1])
+        ]
+        block = pending[overlapping[0]] if len(overlapping) == 1 else None
+
+        if (block is not None and absorb_single_qudit
+                and operation.is_single_qudit_operation()
+                and indices[0] in block[1]
+                and is_unitary(operation.node(copy=False))):
+            d = operation.qudit_dimension
+            identity = np.identity(d, dtype=block[0].dtype)
+            if indices[0] == block[1][0]:
+                gate = np.kron(operation.tensor(), identity)
+            else:
+                gate = np.kron(identity, operation.tensor())
+            block[0] = gate @ block[0]
+            block[2] = None
+
+        elif (block is not None and operation.is_two_qudit_operation()
+              and set(indices) == set(block[1])):
+            gate = operation.tensor()
+            if indices != block[1]:
+                # Reorder the gate to act on the indices of the block
+                d = operation.qudit_dimension
+                gate = np.reshape(gate, newshape=[d] * 4)
+                gate = np.reshape(
+                    np.transpose(gate, (1, 0, 3, 2)), newshape=(d * d, d * d)
+                )
+            block[0] = gate @ block[0]
+            block[2] = None
+
+        else:
+            # Yield the overlapping blocks and all blocks started before them
+            if overlapping:
+                for block in pending[:overlapping[-1] + 1]:
+                    yield flush(block)
+                del pending[:overlapping[-1] + 1]
+            if operation.is_two_qudit_operation():
+                pending.append([operation.tensor(), indices, operation])
+            else:
+                yield operation
+
+    for block in pending:
+        yield flush(block)
+
+
 class MPSimCircuit(cirq.Circuit):
     """Defines MPS Circuits which extend cirq.Circuits and can be simulated by
     an MPS Simulator.
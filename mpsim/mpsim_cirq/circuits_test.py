@@ -1,12 +1,19 @@
 """Tests for MPSIM Circuits."""
 
 import numpy as np
+import pytest
 
 import cirq
 
 import mpsim
 from mpsim import MPSOperation
 from mpsim.mpsim_cirq import MPSimCircuit
+from mpsim.mpsim_cirq.circuits import (
+    fuse_local_blocks,
+    fuse_operations,
+    line_qubit_index_lookup,
+    mps_operation_from_gate_operation,
+)
 
 
 def test_from_gate_operation_not_gate():
@@ -179,3 +186,150 @@ def test_convert_and_manually_simulate_circuit_nonlocal_operations_ghz_state():
     correct = np.zeros(shape=(8,))
     correct[0] = correct[-1] = 1. / np.sqrt(2)
     assert np.allclose(mps.wavefunction(), correct)
+
+
+def test_fuse_operations():
+    """Tests fused MPS Operations give the same wavefunction with fewer
+    operations.
+    """
+    qreg = cirq.LineQubit.range(4)
+    circuit = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.rz(0.3).on(qreg[0]),
+        cirq.CNOT(qreg[1], qreg[0]),
+        cirq.X(qreg[3]),
+        cirq.CZ(qreg[0], qreg[2]),
+        cirq.ry(0.7).on(qreg[1]),
+        cirq.T(qreg[1]),
+    )
+    qubit_to_index_map = {qubit: i for i, qubit in enumerate(qreg)}
+    operations = [
+        MPSOperation.from_gate_operation(operation, qubit_to_index_map)
+        for operation in circuit.all_operations()
+    ]
+    fused = list(fuse_operations(operations))
+    assert len(fused) == 4
+    assert all(operation.is_valid() for operation in fused)
+
+    mps = mpsim.MPS(nqudits=4)
+    mps.apply(fused)
+    assert np.allclose(
+        mps.wavefunction(), circuit.final_wavefunction(), atol=1e-6
+    )
+
+
+def test_fuse_operations_keeps_non_unitary_operations():
+    """Tests non-unitary single qudit operations are not fused, so the MPS is
+    still renormalized after them.
+    """
+    projector = mpsim.gates.computational_basis_projector(state=0)
+    operations = [
+        MPSOperation(mpsim.gates.hgate(), 0),
+        MPSOperation(mpsim.gates.hgate(), 1),
+        MPSOperation(projector, 0),
+        MPSOperation(mpsim.gates.cnot(), (0, 1)),
+        MPSOperation(projector, 1),
+        MPSOperation(mpsim.gates.haar_random_unitary(seed=1), (1, 2)),
+    ]
+    mps = mpsim.MPS(nqudits=3)
+    mps.apply(operations)
+
+    for fused in (
+            list(fuse_operations(operations)),
+            list(fuse_local_blocks(operations)),
+            list(fuse_local_blocks(fuse_operations(operations))),
+    ):
+        assert operations[2] in fused and operations[4] in fused
+        assert fused.index(operations[2]) < fused.index(operations[4])
+
+        fused_mps = mpsim.MPS(nqudits=3)
+        fused_mps.apply(fused)
+        assert np.isclose(fused_mps.norm(), 1.)
+        assert np.allclose(fused_mps.wavefunction(), mps.wavefunction())
+
+
+def test_fuse_local_blocks():
+    """Tests fusing operations on the same pair of qudits into blocks gives
+    the same wavefunction with fewer operations.
+    """
+    qreg = cirq.LineQubit.range(4)
+    circuit = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[1]),
+        cirq.CZ(qreg[2], qreg[3]),
+        cirq.CNOT(qreg[1], qreg[0]),
+        cirq.rz(0.3).on(qreg[0]),
+        cirq.CZ(qreg[0], qreg[1]) ** 0.5,
+        cirq.CNOT(qreg[1], qreg[2]),
+        cirq.X(qreg[3]),
+    )
+    qubit_to_index_map = {qubit: i for i, qubit in enumerate(qreg)}
+    operations = [
+        MPSOperation.from_gate_operation(operation, qubit_to_index_map)
+        for operation in circuit.all_operations()
+    ]
+    for fused, nfused in (
+            (list(fuse_local_blocks(operations)), 7),
+            (list(fuse_local_blocks(fuse_operations(operations))), 4),
+    ):
+        assert len(fused) == nfused
+        assert all(operation.is_valid() for operation in fused)
+
+        mps = mpsim.MPS(nqudits=4)
+        mps.apply(fused)
+        assert np.allclose(
+            mps.wavefunction(), circuit.final_wavefunction(), atol=1e-6
+        )
+
+
+def test_fuse_local_blocks_keeps_order_with_truncation():
+    """Tests blocks which can't be merged are not reordered past operations
+    acting on qudits between their indices, so that fusing gives the same
+    MPS when singular values are truncated.
+    """
+    operations = [
+        MPSOperation(mpsim.gates.haar_random_unitary(seed=i), indices)
+        for i, indices in enumerate(
+            [(0, 1), (2, 3), (1, 2), (0, 3), (3, 4)]
+        )
+    ]
+    fused = list(fuse_local_blocks(operations))
+    assert [op.qudit_indices for op in fused] == [
+        op.qudit_indices for op in operations
+    ]
+
+    mps = mpsim.MPS(nqudits=5)
+    mps.apply(operations, maxsvals=2)
+    fused_mps = mpsim.MPS(nqudits=5)
+    fused_mps.apply(fused, maxsvals=2)
+    assert np.allclose(fused_mps.wavefunction(), mps.wavefunction())
+
+
+def test_line_qubit_index_lookup():
+    """Tests the line qubit lookup gives the same MPS indices as a dictionary
+    and is only built for non-negative line qubits.
+    """
+    qreg = [cirq.LineQubit(x) for x in (3, 0, 2)]
+    lookup = line_qubit_index_lookup(qreg)
+    assert lookup == [1, -1, 2, 0]
+
+    qubit_to_index_map = {qubit: i for i, qubit in enumerate(qreg)}
+    operation = cirq.CNOT(qreg[2], qreg[0])
+    from_map = mps_operation_from_gate_operation(operation, qubit_to_index_map)
+    from_lookup = mps_operation_from_gate_operation(operation, lookup)
+    assert from_lookup.qudit_indices == from_map.qudit_indices == (2, 0)
+
+    assert line_qubit_index_lookup([cirq.LineQubit(-1)]) is None
+    assert line_qubit_index_lookup([cirq.LineQubit(100)]) is None
+    assert line_qubit_index_lookup(cirq.GridQubit.rect(1, 2)) is None
+
+
+def test_line_qubit_index_lookup_missing_qubits_raise_error():
+    """Tests converting operations on qubits which are not in a line qubit
+    lookup raises an error.
+    """
+    lookup = line_qubit_index_lookup([cirq.LineQubit(x) for x in (3, 0, 2)])
+    for qubit in (cirq.LineQubit(1), cirq.LineQubit(4), cirq.LineQubit(-1),
+                  cirq.GridQubit(0, 0)):
+        with pytest.raises(ValueError):
+            mps_operation_from_gate_operation(cirq.H(qubit), lookup)
@@ -1,13 +1,21 @@
 """Defines MPSIM Simulator for Cirq circuits."""
 
-from typing import Any, List, Union
+from concurrent.futures import ProcessPoolExecutor
+import numbers
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
 
 from cirq import Circuit, ops, protocols, study
 from cirq.sim import SimulatesFinalState
 
-from mpsim import MPS
+from mpsim import MPS, MPSOperation
 from mpsim.mpsim_cirq.circuits import (
-    MPSimCircuit, mps_operation_from_gate_operation
+    MPSimCircuit,
+    fuse_local_blocks,
+    fuse_operations,
+    line_qubit_index_lookup,
+    mps_operation_from_gate_operation,
 )
 
 
@@ -21,14 +29,115 @@ class MPSimulator(SimulatesFinalState):
 
             Valid options:
                 "maxsvals" (int): Number of singular values to keep after each
-                                  two qubit gate.
+                                  two qubit operation. Consecutive two qubit
+                                  gates on the same pair of qubits are fused
+                                  into one operation (see fuse_local_blocks),
+                                  so they are truncated once. Single qubit
+                                  operations are then applied where they
+                                  appear in the circuit instead of being
+                                  multiplied into two qubit operations (see
+                                  fuse_operations), since moving them past
+                                  truncated SWAP gates can change which
+                                  singular vectors are kept.
 
                 "fraction" (float): Number of singular values to keep expressed
                                     as a fraction of the maximum bond dimension
-                                    for the given tensor.
+                                    for the given tensor, after each (fused)
+                                    two qubit operation as for "maxsvals".
+
+                "n_workers" (int): Number of processes to simulate parameter
+                                   resolvers of a sweep with. Default is one,
+                                   i.e., resolvers are simulated sequentially.
+
+                "dtype" (np.dtype): Data type of gate unitaries and MPS
+                                    tensors, e.g. np.complex64 to halve memory
+                                    traffic. By default unitaries keep the data
+                                    type Cirq returns them in. With complex64,
+                                    singular values below ~1e-7 of the largest
+                                    are noise, so "fraction" or "maxsvals" may
+                                    need to be loosened.
+
+                "backend" (str): Array backend of the MPS, either "numpy"
+                                 (default) or "cupy" to apply gates on a CUDA
+                                 GPU. See mpsim.MPS.
+
+                "contract" (str): How two qubit gates are contracted with the
+                                  MPS tensors, either "einsum" (default) or
+                                  "tensordot". See MPS.apply_two_qudit_gate.
+
+                "svd" (str): How singular values are computed for two qubit
+                             operations, either "exact" (default) or
+                             "randomized" for a faster but approximate SVD
+                             when "maxsvals" or "fraction" keep few of them.
+                             See MPS.apply_two_qudit_gate.
+
+        Raises:
+            ValueError: If both "maxsvals" and "fraction" are provided, if
+                "fraction" is not between 0 and 1, or if "backend",
+                "contract" or "svd" is not supported.
         """
+        options = dict(options)
+        self._n_workers = int(options.pop("n_workers", 1))
+        self._dtype = options.pop("dtype", None)
+        self._backend = options.pop("backend", "numpy")
+        if self._backend not in ("numpy", "cupy"):
+            raise ValueError(
+                f"Backend should be 'numpy' or 'cupy' but is {self._backend}."
+            )
+
+        # Check and convert the truncation options once here instead of
+        # waiting for the first two qudit gate of a simulation
+        if "maxsvals" in options and "fraction" in options:
+            raise ValueError(
+                "Only one of (fraction, maxsvals) can be provided as options."
+            )
+        if "maxsvals" in options:
+            options["maxsvals"] = int(options["maxsvals"])
+        if options.get("contract", "einsum") not in ("einsum", "tensordot"):
+            raise ValueError(
+                "Option contract should be 'einsum' or 'tensordot' but is "
+                f"{options['contract']}."
+            )
+        if options.get("svd", "exact") not in ("exact", "randomized"):
+            raise ValueError(
+                "Option svd should be 'exact' or 'randomized' but is "
+                f"{options['svd']}."
+            )
+        if "fraction" in options:
+            options["fraction"] = float(options["fraction"])
+            if not (0 <= options["fraction"] <= 1):
+                raise ValueError(
+                    "Option fraction must be between 0 and 1 but is "
+                    f"{options['fraction']}."
+                )
         self._options = options
 
+    def simulate(
+            self,
+            program: Union[Circuit, MPSimCircuit],
+            param_resolver: study.ParamResolverOrSimilarType = None,
+            qubit_order: ops.QubitOrderOrList = ops.QubitOrder.DEFAULT,
+            initial_state: Any = None,
+    ) -> MPS:
+        """Simulates the supplied Circuit and returns the final MPS.
+
+        The single parameter resolver is simulated directly instead of being
+        converted to a sweep first.
+
+        Args:
+            program: The circuit to simulate.
+            param_resolver: Parameters to run with the program.
+            qubit_order: Determines the canonical ordering of the qubits.
+            initial_state: The initial state for the simulation. See
+                simulate_sweep.
+        """
+        return self._simulate(
+            program,
+            [study.ParamResolver(param_resolver)],
+            qubit_order,
+            initial_state,
+        )[0]
+
     def simulate_sweep(
             self,
             program: Union[Circuit, MPSimCircuit],
@@ -48,41 +157,251 @@ class MPSimulator(SimulatesFinalState):
             qubit_order: Determines the canonical ordering of the qubits. This
                 is often used in specifying the initial state, i.e. the
                 ordering of the computational basis states.
-            initial_state: The initial state for the simulation. The form of
-                this state depends on the simulation implementation.  See
-                documentation of the implementing class for details.
+            initial_state: The initial state for the simulation. Either an
+                integer label of a computational basis state in the qubit
+                order (default is zero), or an MPS on the qubits of the
+                program, which is copied for each parameter resolver and keeps
+                its own backend. To start from a state vector, pass
+                MPS.from_wavefunction of it.
         Returns:
             List of SimulationTrialResults for this run, one for each
             possible parameter resolver.
+
+        Raises:
+            ValueError: If the program is not a circuit, if an MPS
+                initial_state has the wrong number of qudits, or if an integer
+                initial_state is not a computational basis state.
+            NotImplementedError: If the initial_state is a state vector.
         """
-        if not isinstance(program, (Circuit, MPSimCircuit)):
+        return self._simulate(
+            program,
+            list(study.to_resolvers(params)),
+            qubit_order,
+            initial_state,
+        )
+
+    def _simulate(
+            self,
+            program: Union[Circuit, MPSimCircuit],
+            param_resolvers: List[study.ParamResolver],
+            qubit_order: ops.QubitOrderOrList,
+            initial_state: Any,
+    ) -> List[MPS]:
+        """Returns the final MPS of the program for each parameter resolver.
+        See simulate_sweep for the arguments.
+        """
+        # MPSimCircuit is a subclass of cirq.Circuit
+        if not isinstance(program, Circuit):
             raise ValueError(
                 f"Program is of type {type(program)} but should be either "
                 "a cirq.Circuit or mpsim.mpsim_cirq.MPSimCircuit."
             )
 
-        param_resolvers = study.to_resolvers(params)
+        # The qubits and their indices in the MPS do not depend on parameters
+        qubits = program.all_qubits()
+        nqudits = len(qubits)
+        ordered_qubits = ops.QubitOrder.as_qubit_order(
+            qubit_order).order_for(qubits)
+        qubit_to_index_map = line_qubit_index_lookup(ordered_qubits)
+        if qubit_to_index_map is None:
+            qubit_to_index_map = dict(zip(ordered_qubits, range(nqudits)))
 
-        trial_results = []
-        for prs in param_resolvers:
-            solved_circuit = protocols.resolve_parameters(program, prs)
+        if initial_state is None:
+            initial_state = 0
+        if isinstance(initial_state, MPS):
+            if initial_state.nqudits != nqudits:
+                raise ValueError(
+                    f"Initial MPS has {initial_state.nqudits} qudits but the "
+                    f"program has {nqudits} qubits."
+                )
+        elif isinstance(initial_state, numbers.Integral):
+            initial_state = int(initial_state)
+            if not 0 <= initial_state < 2 ** nqudits:
+                raise ValueError(
+                    f"Initial state {initial_state} is not a computational "
+                    f"basis state of {nqudits} qubits."
+                )
+        else:
+            raise NotImplementedError(
+                "Initial states other than a computational basis state or an "
+                "MPS are not supported. Use MPS.from_wavefunction to convert "
+                "a state vector to an MPS."
+            )
 
-            ordered_qubits = ops.QubitOrder.as_qubit_order(
-                qubit_order).order_for(
-                solved_circuit.all_qubits())
+        n_workers = min(self._n_workers, len(param_resolvers))
+        if n_workers <= 1:
+            return _simulate_resolvers(
+                program,
+                param_resolvers,
+                nqudits,
+                qubit_to_index_map,
+                initial_state,
+                self._dtype,
+                self._backend,
+                self._options
+            )
 
-            qubit_to_index_map = {
-                qubit: index for index, qubit in enumerate(ordered_qubits)
-            }
+        # Split the resolvers evenly between the worker processes
+        chunks = [
+            param_resolvers[i::n_workers] for i in range(n_workers)
+        ]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(
+                _simulate_resolvers,
+                [program] * n_workers,
+                chunks,
+                [nqudits] * n_workers,
+                [qubit_to_index_map] * n_workers,
+                [initial_state] * n_workers,
+                [self._dtype] * n_workers,
+                [self._backend] * n_workers,
+                [self._options] * n_workers,
+            ))
 
-            mps = MPS(nqudits=len(solved_circuit.all_qubits()))
-            # TODO: Account for an input ordering of operations to apply here
-            operations = [
-                mps_operation_from_gate_operation(
-                    gate_operation, qubit_to_index_map
-                )
-                for gate_operation in solved_circuit.all_operations()
-            ]
-            mps.apply(operations, **self._options)
-            trial_results.append(mps)
+        # Restore the order of the resolvers
+        trial_results = [None] * len(param_resolvers)
+        for i, chunk_results in enumerate(results):
+            trial_results[i::n_workers] = chunk_results
         return trial_results
+
+
+def _simulate_resolvers(
+        program: Circuit,
+        param_resolvers: List[study.ParamResolver],
+        nqudits: int,
+        qubit_to_index_map: Union[Dict[ops.Qid, int], List[int]],
+        initial_state: Union[int, MPS],
+        dtype: Optional[np.dtype],
+        backend: str,
+        options: dict,
+) -> List[MPS]:
+    """Returns the final MPS of the program for each parameter resolver.
+
+    This is a module-level function so that it can be run in worker processes.
+
+    Args:
+        program: The circuit to simulate.
+        param_resolvers: Parameters to run with the program.
+        nqudits: Number of qudits in the program.
+        qubit_to_index_map: Dictionary or line qubit lookup to map qubits to
+            MPS indices. See mps_operation_from_gate_operation.
+        initial_state: Computational basis state or MPS to start from.
+        dtype: Data type to cast unitaries and the initial MPS to, if any.
+        backend: Array backend of the MPS.
+        options: Options passed to MPS.apply.
+    """
+    # Convert operations without parameters once for all resolvers. Other
+    # operations are converted once for each distinct resolved operation.
+    needs_resolve = protocols.is_parameterized(program)
+    operations_template = [
+        gate_operation
+        if needs_resolve and protocols.is_parameterized(gate_operation)
+        else mps_operation_from_gate_operation(
+            gate_operation, qubit_to_index_map, dtype
+        )
+        for gate_operation in program.all_operations()
+    ]  # type: List[Union[MPSOperation, ops.Operation]]
+    operation_cache = {}  # type: Dict[ops.Operation, MPSOperation]
+    truncate = "maxsvals" in options or "fraction" in options
+
+    # Where operations are fused only depends on the qudits they act on, so
+    # operations without parameters are fused once for all resolvers
+    if needs_resolve and len(param_resolvers) > 1:
+        operations_template = _fuse_unparameterized_operations(
+            operations_template, truncate
+        )
+
+    def resolve(
+            operation: Union[MPSOperation, ops.Operation],
+            prs: study.ParamResolver
+    ) -> MPSOperation:
+        if isinstance(operation, MPSOperation):
+            return operation
+        resolved = protocols.resolve_parameters(operation, prs)
+        if resolved not in operation_cache:
+            operation_cache[resolved] = mps_operation_from_gate_operation(
+                resolved, qubit_to_index_map, dtype
+            )
+        return operation_cache[resolved]
+
+    # Resolvers with the same parameter values share one simulation. Without
+    # parameters in the program, all resolvers share one simulation. Copies
+    # of an MPS share its tensors, which are never modified in place.
+    final_states = {}  # type: Dict[Any, MPS]
+
+    trial_results = []
+    for prs in param_resolvers:
+        key = _resolver_key(prs) if needs_resolve else frozenset()
+        if key is not None and key in final_states:
+            trial_results.append(final_states[key].copy())
+            continue
+
+        if isinstance(initial_state, MPS):
+            mps = initial_state.copy()
+        else:
+            mps = MPS(
+                nqudits=nqudits,
+                backend=backend,
+                state=initial_state,
+                dtype=dtype,
+            )
+        # TODO: Account for an input ordering of operations to apply here
+        # Operations are resolved lazily as MPS.apply consumes them
+        operations = (
+            resolve(operation, prs) for operation in operations_template
+        )
+        fused = _fuse(operations, truncate)
+        mps.apply_schedule(
+            (operation.schedule_entry() for operation in fused), **options
+        )
+        if key is not None:
+            final_states[key] = mps
+        trial_results.append(mps)
+    return trial_results
+
+
+def _fuse(
+        operations: Iterable[MPSOperation], truncate: bool
+) -> Iterator[MPSOperation]:
+    """Returns the MPS Operations fused for the simulator.
+
+    Args:
+        operations: MPS Operations to fuse, in the order they are applied.
+        truncate: If True, singular values are truncated after two qubit
+            operations, so single qubit operations are not fused. See
+            MPSimulator.
+    """
+    if truncate:
+        return fuse_local_blocks(operations, absorb_single_qudit=False)
+    return fuse_local_blocks(fuse_operations(operations))
+
+
+def _fuse_unparameterized_operations(
+        operations: List[Union[MPSOperation, ops.Operation]],
+        truncate: bool,
+) -> List[Union[MPSOperation, ops.Operation]]:
+    """Returns the operations with each run of consecutive MPS Operations
+    fused (see _fuse), keeping the (parameterized) Cirq operations between
+    the runs.
+    """
+    fused = []  # type: List[Union[MPSOperation, ops.Operation]]
+    run = []  # type: List[MPSOperation]
+    for operation in operations:
+        if isinstance(operation, MPSOperation):
+            run.append(operation)
+            continue
+        fused.extend(_fuse(run, truncate))
+        fused.append(operation)
+        run = []
+    fused.extend(_fuse(run, truncate))
+    return fused
+
+
+def _resolver_key(prs: study.ParamResolver) -> Optional[frozenset]:
+    """Returns a hashable key for the parameter values of the resolver, or
+    None if the values can't be hashed.
+    """
+    try:
+        return frozenset(prs.param_dict.items())
+    except TypeError:
+        return None
@@ -8,8 +8,9 @@ import cirq
 
 import pytest
 
-from mpsim import MPS
+from mpsim import MPS, MPSOperation
 from mpsim.mpsim_cirq.circuits import MPSimCircuit
+from mpsim.mpsim_cirq import simulator
 from mpsim.mpsim_cirq.simulator import MPSimulator
 
 
@@ -19,6 +20,13 @@ def test_empty_circuit_raises_error():
         MPSimulator().simulate(cirq.Circuit())
 
 
+def test_simulate_invalid_program_raises_error():
+    """Tests that an error is raised when the program is not a circuit."""
+    qreg = cirq.LineQubit.range(2)
+    with pytest.raises(ValueError):
+        MPSimulator().simulate([cirq.H(qreg[0]), cirq.CNOT(*qreg)])
+
+
 def test_simulate_identity_circuit():
     """Tests simulating an identity circuit on three qubits."""
     qreg = cirq.LineQubit.range(3)
@@ -94,6 +102,48 @@ def test_simulate_bell_state_cirq_circuit_with_truncation():
     )
 
 
+def test_invalid_truncation_options():
+    """Tests invalid truncation options raise errors when the simulator is
+    created.
+    """
+    with pytest.raises(ValueError):
+        MPSimulator(options={"maxsvals": 2, "fraction": 0.5})
+
+    with pytest.raises(ValueError):
+        MPSimulator(options={"fraction": 1.5})
+
+
+@pytest.mark.parametrize("options", [{"maxsvals": 2}, {"fraction": 0.5}])
+def test_simulate_with_truncation_matches_mps(options: dict):
+    """Tests simulating with truncation gives the same MPS as applying the
+    operations of the circuit in order, i.e., single qubit operations are not
+    moved past truncated SWAP gates.
+    """
+    qreg = cirq.LineQubit.range(6)
+    circ = cirq.Circuit()
+    for i, indices in enumerate(
+        [(1, 2), (5, 3), (2, 4), (0, 1), (2,), (4, 1), (0,), (4, 0)]
+    ):
+        unitary = cirq.testing.random_unitary(
+            2 ** len(indices), random_state=i
+        )
+        circ.append(
+            cirq.MatrixGate(unitary).on(*[qreg[j] for j in indices]),
+            strategy=cirq.InsertStrategy.NEW,
+        )
+
+    mps = MPS(nqudits=6)
+    mps.apply(
+        [
+            MPSOperation.from_gate_operation(operation, dict(zip(qreg, range(6))))
+            for operation in circ.all_operations()
+        ],
+        **options
+    )
+    res = MPSimulator(options=options).simulate(circ)
+    assert np.allclose(res.wavefunction(), mps.wavefunction())
+
+
 def test_simulate_one_dimensional_supremacy_circuit():
     """Tests simulating a one-dimensional supremacy circuit
     using the MPSimulator.
@@ -355,3 +405,341 @@ def test_simulate_sweep():
     ]
     for (mpsim_wf, cirq_wf) in zip(all_wavefunctions, correct_wavefunctions):
         assert np.allclose(mpsim_wf, cirq_wf)
+
+
+def test_simulate_sweep_converts_each_operation_once(monkeypatch):
+    """Tests simulate_sweep converts operations without parameters once and
+    parameterized operations once for each distinct resolved operation.
+    """
+    qreg = cirq.LineQubit.range(3)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[2]),
+        cirq.rz(theta).on(qreg[1]),
+        cirq.CZ(*qreg[1:]) ** theta,
+    )
+    param_resolvers = [{"theta": value} for value in (0.1, 0.2, 0.1, 0.2)]
+
+    nconversions = 0
+    convert = simulator.mps_operation_from_gate_operation
+
+    def counting_convert(*args):
+        nonlocal nconversions
+        nconversions += 1
+        return convert(*args)
+
+    monkeypatch.setattr(
+        simulator, "mps_operation_from_gate_operation", counting_convert
+    )
+    allmps = MPSimulator().simulate_sweep(circ, param_resolvers)
+    assert nconversions == 4 + 2 * 2
+    for mps, pr in zip(allmps, param_resolvers):
+        correct = cirq.resolve_parameters(circ, pr).final_wavefunction()
+        assert np.allclose(mps.wavefunction(), correct, atol=1e-6)
+
+
+def test_simulate_sweep_simulates_repeated_resolvers_once(monkeypatch):
+    """Tests simulate_sweep returns independent copies of one simulation for
+    resolvers with the same parameter values.
+    """
+    qreg = cirq.LineQubit.range(2)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(cirq.H(qreg[0]), cirq.CNOT(*qreg) ** theta)
+    param_resolvers = [{"theta": value} for value in (0.5, 1.0, 0.5, 0.5)]
+
+    nsimulations = 0
+    apply_schedule = MPS.apply_schedule
+
+    def counting_apply_schedule(*args, **kwargs):
+        nonlocal nsimulations
+        nsimulations += 1
+        return apply_schedule(*args, **kwargs)
+
+    monkeypatch.setattr(MPS, "apply_schedule", counting_apply_schedule)
+    allmps = MPSimulator().simulate_sweep(circ, param_resolvers)
+    assert nsimulations == 2
+    assert len(allmps) == 4
+    assert allmps[0] is not allmps[2] and allmps[2] is not allmps[3]
+    # Copies share the tensors of the simulated MPS instead of copying them
+    assert all(
+        a is b for a, b in zip(allmps[0]._tensors, allmps[3]._tensors)
+    )
+    for mps, pr in zip(allmps, param_resolvers):
+        correct = cirq.resolve_parameters(circ, pr).final_wavefunction()
+        assert np.allclose(mps.wavefunction(), correct, atol=1e-6)
+
+    # Modifying one copy does not change the others
+    allmps[0].x(0)
+    assert np.allclose(allmps[2].wavefunction(), allmps[3].wavefunction())
+    assert not np.allclose(allmps[0].wavefunction(), allmps[2].wavefunction())
+
+
+def test_simulate_sweep_without_parameters_simulates_once(monkeypatch):
+    """Tests simulate_sweep simulates a circuit without parameters once for
+    all resolvers.
+    """
+    qreg = cirq.LineQubit.range(3)
+    circ = cirq.Circuit(cirq.H(qreg[0]), cirq.CNOT(qreg[0], qreg[2]))
+    param_resolvers = [{"shot": value} for value in range(4)]
+
+    nsimulations = 0
+    apply_schedule = MPS.apply_schedule
+
+    def counting_apply_schedule(*args, **kwargs):
+        nonlocal nsimulations
+        nsimulations += 1
+        return apply_schedule(*args, **kwargs)
+
+    monkeypatch.setattr(MPS, "apply_schedule", counting_apply_schedule)
+    allmps = MPSimulator().simulate_sweep(circ, param_resolvers)
+    assert nsimulations == 1
+    assert len(set(map(id, allmps))) == 4
+    for mps in allmps:
+        assert np.allclose(mps.wavefunction(), circ.final_wavefunction())
+
+
+def test_simulate_with_initial_state():
+    """Tests simulating from a computational basis state or an MPS and that
+    the initial MPS is not modified.
+    """
+    qreg = cirq.LineQubit.range(3)
+    circ = cirq.Circuit(
+        cirq.X(qreg[0]), cirq.H(qreg[1]), cirq.CNOT(qreg[1], qreg[2])
+    )
+    sim = MPSimulator()
+    for state in range(2 ** 3):
+        mps = sim.simulate(circ, initial_state=state)
+        correct = circ.final_wavefunction(initial_state=state)
+        assert np.allclose(mps.wavefunction(), correct)
+
+    mps = sim.simulate(circ, initial_state=np.int64(5))
+    assert np.allclose(
+        mps.wavefunction(), circ.final_wavefunction(initial_state=5)
+    )
+
+    initial_mps = MPS(nqudits=3, state=4)
+    mps = sim.simulate(circ, initial_state=initial_mps)
+    assert np.allclose(
+        mps.wavefunction(), circ.final_wavefunction(initial_state=4)
+    )
+    assert np.allclose(initial_mps.wavefunction(), np.eye(8)[4])
+
+
+def test_simulate_with_invalid_initial_state():
+    """Tests errors are raised for an initial MPS on the wrong number of
+    qudits, for computational basis states out of range, and for state
+    vectors.
+    """
+    qreg = cirq.LineQubit.range(3)
+    circ = cirq.Circuit(cirq.H.on_each(*qreg))
+    sim = MPSimulator()
+    with pytest.raises(ValueError):
+        sim.simulate(circ, initial_state=MPS(nqudits=2))
+
+    for state in (-1, 2 ** 3):
+        with pytest.raises(ValueError):
+            sim.simulate(circ, initial_state=state)
+
+    with pytest.raises(NotImplementedError):
+        sim.simulate(circ, initial_state=np.eye(8)[0])
+
+
+@pytest.mark.parametrize("dtype", [np.complex64, np.complex128])
+def test_simulate_with_dtype(dtype):
+    """Tests the dtype option sets the data type of all MPS tensors."""
+    qreg = cirq.LineQubit.range(4)
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[2]),
+        cirq.CZ(qreg[1], qreg[2]) ** 0.3,
+        cirq.rx(0.7).on(qreg[3]),
+    )
+    mps = MPSimulator(options={"dtype": dtype}).simulate(circ)
+    assert all(tensor.dtype == dtype for tensor in mps._tensors)
+    assert np.allclose(mps.wavefunction(), circ.final_wavefunction(), atol=1e-6)
+
+
+def test_invalid_backend_option():
+    """Tests an unsupported backend raises an error when the simulator is
+    created.
+    """
+    with pytest.raises(ValueError):
+        MPSimulator(options={"backend": "torch"})
+
+
+def test_simulate_with_cupy_backend():
+    """Tests simulating on a GPU gives the same wavefunction as Cirq."""
+    pytest.importorskip("cupy")
+    qreg = cirq.LineQubit.range(4)
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[3]),
+        cirq.CZ(qreg[1], qreg[2]) ** 0.3,
+    )
+    mps = MPSimulator(options={"backend": "cupy"}).simulate(circ)
+    assert np.allclose(mps.wavefunction(), circ.final_wavefunction(), atol=1e-6)
+
+
+def test_simulate_with_cupy_backend_on_mock_gpu(fake_cupy):
+    """Tests simulating a sweep with the cupy backend keeps the tensors on the
+    device and gives the same wavefunctions as Cirq, using a mock GPU array
+    module.
+    """
+    qreg = cirq.LineQubit.range(4)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[3]),
+        cirq.CZ(qreg[1], qreg[2]) ** theta,
+        cirq.X(qreg[2]) ** 0.25,
+        cirq.ZZ(qreg[2], qreg[0]),
+    )
+    params = cirq.Linspace("theta", start=0.0, stop=1.0, length=3)
+    sim = MPSimulator(options={"backend": "cupy"})
+    mpss = sim.simulate_sweep(circ, params)
+    for mps, resolver in zip(mpss, cirq.to_resolvers(params)):
+        assert all(
+            isinstance(tensor, type(fake_cupy.ones(1)))
+            for tensor in mps._tensors
+        )
+        correct = cirq.resolve_parameters(circ, resolver).final_wavefunction()
+        assert np.allclose(mps.wavefunction(), correct, atol=1e-6)
+
+
+def test_simulate_with_param_resolver():
+    """Tests simulate returns the MPS of simulate_sweep for one resolver."""
+    qreg = cirq.LineQubit.range(3)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CZ(qreg[0], qreg[2]) ** theta,
+    )
+    sim = MPSimulator()
+    mps = sim.simulate(circ, param_resolver={"theta": 0.4})
+    assert isinstance(mps, MPS)
+    swept, = sim.simulate_sweep(circ, cirq.ParamResolver({"theta": 0.4}))
+    assert mps == swept
+
+
+def test_simulate_sweep_fuses_operations_without_parameters_once(
+        monkeypatch
+):
+    """Tests simulate_sweep fuses operations without parameters once and
+    operations with parameters for each resolver.
+    """
+    qreg = cirq.LineQubit.range(3)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[1]),
+        cirq.CNOT(qreg[1], qreg[0]),
+        cirq.rz(theta).on(qreg[1]),
+        cirq.CZ(qreg[1], qreg[2]),
+        cirq.X(qreg[2]),
+        cirq.CZ(qreg[1], qreg[2]),
+    )
+    param_resolvers = [{"theta": value} for value in (0.1, 0.2, 0.3)]
+
+    nfused = []
+    fuse = simulator.fuse_local_blocks
+
+    def counting_fuse(operations):
+        operations = list(operations)
+        nfused.append(len(operations))
+        return fuse(operations)
+
+    monkeypatch.setattr(simulator, "fuse_local_blocks", counting_fuse)
+    allmps = MPSimulator().simulate_sweep(circ, param_resolvers)
+    # The two runs without parameters are fused once, then each resolver
+    # only fuses the fused runs with its resolved operation
+    assert nfused[:2] == [3, 2]
+    assert nfused[2:] == [2] * 3
+    for mps, pr in zip(allmps, param_resolvers):
+        correct = cirq.resolve_parameters(circ, pr).final_wavefunction()
+        assert np.allclose(mps.wavefunction(), correct, atol=1e-6)
+
+
+def test_simulate_with_tensordot_contraction():
+    """Tests the tensordot contraction option gives the same MPS as the
+    default einsum contraction.
+    """
+    circuit = cirq.experiments.generate_boixo_2018_supremacy_circuits_v2_grid(
+        n_rows=1, n_cols=5, cz_depth=6, seed=1
+    )
+    einsum_mps = MPSimulator().simulate(circuit)
+    tensordot_mps = MPSimulator(options={"contract": "tensordot"}).simulate(
+        circuit
+    )
+    assert np.allclose(
+        tensordot_mps.wavefunction(), einsum_mps.wavefunction(), atol=1e-6
+    )
+
+    with pytest.raises(ValueError):
+        MPSimulator(options={"contract": "matmul"})
+
+
+def test_simulate_with_randomized_svd():
+    """Tests the randomized SVD option matches the default exact SVD when
+    no singular values are truncated.
+    """
+    circuit = cirq.experiments.generate_boixo_2018_supremacy_circuits_v2_grid(
+        n_rows=1, n_cols=5, cz_depth=6, seed=1
+    )
+    exact_mps = MPSimulator().simulate(circuit)
+    randomized_mps = MPSimulator(options={"svd": "randomized"}).simulate(
+        circuit
+    )
+    assert np.allclose(
+        randomized_mps.wavefunction(), exact_mps.wavefunction(), atol=1e-6
+    )
+
+    with pytest.raises(ValueError):
+        MPSimulator(options={"svd": "lanczos"})
+
+
+def test_simulate_sweep_with_worker_processes():
+    """Tests simulate_sweep with resolvers split between worker processes
+    returns the same MPS in the same order as sequential simulation.
+    """
+    qreg = cirq.LineQubit.range(3)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.H.on_each(*qreg),
+        cirq.CNOT(qreg[0], qreg[2]),
+        cirq.rx(theta).on(qreg[1]),
+    )
+    param_resolvers = [
+        {"theta": value} for value in np.linspace(0, np.pi, 5)
+    ]
+    sequential = MPSimulator().simulate_sweep(circ, param_resolvers)
+    parallel = MPSimulator(
+        options={"n_workers": 2}
+    ).simulate_sweep(circ, param_resolvers)
+    assert len(parallel) == len(param_resolvers)
+    for (mps, correct) in zip(parallel, sequential):
+        assert isinstance(mps, MPS)
+        assert np.allclose(mps.wavefunction(), correct.wavefunction())
+
+
+def test_simulate_sweep_with_qubit_order():
+    """Tests the qubit order, which is computed once for all resolvers, is
+    used for every resolver of a sweep.
+    """
+    qreg = cirq.LineQubit.range(3)
+    theta = sympy.Symbol("theta")
+    circ = cirq.Circuit(
+        cirq.X(qreg[0]),
+        cirq.rx(theta).on(qreg[1]),
+        cirq.CNOT(qreg[1], qreg[2]),
+    )
+    qubit_order = [qreg[2], qreg[0], qreg[1]]
+    param_resolvers = [{"theta": value} for value in (0.5, 1.5)]
+    allmps = MPSimulator().simulate_sweep(
+        circ, param_resolvers, qubit_order=qubit_order
+    )
+    for mps, pr in zip(allmps, param_resolvers):
+        correct = cirq.resolve_parameters(circ, pr).final_wavefunction(
+            qubit_order=qubit_order
+        )
+        assert np.allclose(mps.wavefunction(), correct, atol=1e-6)